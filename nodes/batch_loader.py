@@ -1,9 +1,14 @@
 """BatchImageLoader node for ComfyUI batch image processing."""
 
+import functools
 import os
+import stat
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from ..utils.file_utils import filter_files_by_patterns, get_pattern_for_preset
-from ..utils.image_utils import load_image_as_tensor
 from ..utils.iteration_state import IterationState
 from ..utils.queue_control import stop_auto_queue, trigger_next_queue
 from ..utils.sorting import natural_sort_key
@@ -16,6 +21,165 @@ except ImportError:
     PromptServer = None
     HAS_SERVER = False
 
+# Verbose per-execution tracing, off by default (set BATCH_LOADER_DEBUG=1 to enable)
+_DEBUG = bool(os.environ.get("BATCH_LOADER_DEBUG"))
+
+
+def _dbg(msg: str, *args) -> None:
+    """Print diagnostic output only when BATCH_LOADER_DEBUG is set.
+
+    Arguments are %-formatted lazily, so nothing is formatted (and no
+    expensive attributes like tensor shapes are read) when tracing is off.
+    """
+    if _DEBUG:
+        print(msg % args if args else msg)
+
+
+@functools.lru_cache(maxsize=64)
+def _directory_info(directory: str) -> tuple[str, str]:
+    """Normalize a directory path and derive its folder name, once per path.
+
+    The normalized path is interned so the per-tick cache and state lookups
+    keyed by it reuse a single string object.
+
+    Args:
+        directory: Raw directory path from the node input
+
+    Returns:
+        Tuple of (normalized directory, folder name)
+    """
+    normalized = sys.intern(os.path.normpath(directory))
+    return normalized, os.path.basename(normalized.rstrip(os.sep))
+
+
+# Per-file entry derived once at scan time: (filename, basename, format, full path)
+FileEntry = tuple[str, str, str, str]
+
+# Sorted file list cache: (directory, pattern) -> (sorted entries, directory mtime_ns)
+# Avoids re-scanning and re-sorting the directory on every queue tick of a batch.
+# Kept in LRU order and bounded, so a long session that visits many directories
+# or patterns does not hold every listing it has ever built.
+_SORTED_CACHE_SIZE = 8
+_SORTED_CACHE: OrderedDict[tuple[str, str], tuple[tuple[FileEntry, ...], int]] = OrderedDict()
+
+
+def _build_entries(directory: str, filenames: list[str]) -> tuple[FileEntry, ...]:
+    """Derive basename, format, and full path for each file in one pass.
+
+    Args:
+        directory: Normalized directory path
+        filenames: Sorted filenames in the directory
+
+    Returns:
+        Tuple of (filename, basename, original_format, filepath) entries; the
+        listing is shared across executions, so it is returned immutable
+    """
+    # Joining "" yields the same prefix os.path.join would use
+    # (e.g. no doubled separator for "/")
+    dir_prefix = os.path.join(directory, "")
+    entries = []
+    for filename in filenames:
+        basename, ext = os.path.splitext(filename)
+        # Original format without the dot (e.g., "png", "jpg")
+        original_format = ext[1:].lower() if ext else "png"
+        entries.append((filename, basename, original_format, dir_prefix + filename))
+    return tuple(entries)
+
+
+def _decode_image(filepath: str):
+    """Decode an image file to a tensor.
+
+    image_utils (torch, numpy, PIL) is imported on first use rather than at
+    module import, keeping the node package cheap to import.
+
+    Args:
+        filepath: Full path to the image file
+
+    Returns:
+        Image tensor from load_image_as_tensor
+    """
+    from ..utils.image_utils import load_image_as_tensor
+
+    return load_image_as_tensor(filepath)
+
+
+# Background decode of upcoming images while downstream nodes process the current one.
+# PIL releases the GIL while decoding, so a small pool decodes images in parallel.
+# filepath -> ((st_mtime_ns, st_size), Future[tensor]); the stat signature taken at
+# schedule time lets a load detect that the file changed since it was prefetched.
+# Only the current image and the next prefetch_count images are kept, so an
+# interrupted or abandoned batch pins at most that many decoded images.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="batch_prefetch")
+_PREFETCH_CACHE: dict[str, tuple[tuple[int, int], Future]] = {}
+
+
+def _file_signature(filepath: str) -> tuple[int, int] | None:
+    """Return (st_mtime_ns, st_size) for a file, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _schedule_prefetch(current: str, upcoming: list[str]) -> None:
+    """Start decoding images in the background for later executions.
+
+    Entries outside the window (the current image plus upcoming) are
+    cancelled and dropped, so the cache follows prefetch_count.
+
+    Args:
+        current: Full path to the image about to be loaded
+        upcoming: Full paths to the images to prefetch, in load order
+    """
+    window = {current, *upcoming}
+    for filepath in [path for path in _PREFETCH_CACHE if path not in window]:
+        _PREFETCH_CACHE.pop(filepath)[1].cancel()
+    for filepath in upcoming:
+        if filepath not in _PREFETCH_CACHE:
+            signature = _file_signature(filepath)
+            if signature is None:
+                # Missing file: let the synchronous load report the error
+                continue
+            _PREFETCH_CACHE[filepath] = (signature, _PREFETCH_POOL.submit(_decode_image, filepath))
+
+
+def _load_tensor(filepath: str):
+    """Load an image tensor, using a prefetched result when available.
+
+    A prefetched decode is only used if the file's mtime and size still match
+    what they were when it was scheduled; otherwise the file is decoded again.
+
+    Args:
+        filepath: Full path to the image file
+
+    Returns:
+        Image tensor from _decode_image
+
+    Raises:
+        Any exception raised while loading (prefetched or not)
+    """
+    entry = _PREFETCH_CACHE.pop(filepath, None)
+    if entry is not None:
+        signature, future = entry
+        if not future.cancelled() and _file_signature(filepath) == signature:
+            return future.result()
+        future.cancel()
+    return _decode_image(filepath)
+
+
+def _clear_prefetch() -> None:
+    """Cancel and drop all prefetched decodes."""
+    for _, future in _PREFETCH_CACHE.values():
+        future.cancel()
+    _PREFETCH_CACHE.clear()
+
+
+def clear_file_cache() -> None:
+    """Clear the sorted file list and prefetch caches (useful for testing)."""
+    _SORTED_CACHE.clear()
+    _clear_prefetch()
+
 
 class BatchImageLoader:
     """
@@ -77,6 +241,15 @@ class BatchImageLoader:
                         "tooltip": "Starting index for batch processing (0-based)",
                     },
                 ),
+                "prefetch_count": (
+                    "INT",
+                    {
+                        "default": 4,
+                        "min": 0,
+                        "max": 16,
+                        "tooltip": "Upcoming images to decode in the background (0 = disabled)",
+                    },
+                ),
             },
             "hidden": {
                 "prompt": "PROMPT",  # Complete workflow for re-queueing
@@ -92,6 +265,71 @@ class BatchImageLoader:
     FUNCTION = "load_image"
     OUTPUT_NODE = False
 
+    @classmethod
+    def _ensure_file_list(
+        cls,
+        directory: str,
+        pattern: str,
+        force_rescan: bool = False,
+        mtime: int | None = None,
+        clear_prefetch: bool = False,
+    ) -> tuple[tuple[FileEntry, ...], int]:
+        """
+        Get the naturally sorted file list, scanning only when needed.
+
+        The cached listing is reused while the directory's mtime is unchanged
+        (adding, removing, or renaming files bumps it), so an in-progress batch
+        only pays for a single stat per execution.
+
+        Args:
+            directory: Normalized directory path
+            pattern: Comma-separated glob patterns
+            force_rescan: Ignore any cached entry and rescan the directory
+            mtime: Directory st_mtime_ns if the caller already stat'ed it
+            clear_prefetch: Drop prefetched decodes when rescanning. Only
+                            load_image passes this: VALIDATE_INPUTS runs on the
+                            server thread and must not touch the prefetch cache
+
+        Returns:
+            Tuple of (sorted (filename, basename, format, filepath) entries, total_count)
+        """
+        key = (directory, pattern)
+        if mtime is None:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                # Missing/unreadable directory: drop any stale entry and don't cache
+                _SORTED_CACHE.pop(key, None)
+                return (), 0
+
+        cached = _SORTED_CACHE.get(key)
+        if force_rescan or cached is None or cached[1] != mtime:
+            # Sort the freshly built list in place; the key is computed once per filename.
+            # A plain string pre-sort is cheap (C-level compares) and leaves the list
+            # nearly in natural order, so the keyed sort's comparisons mostly merge runs.
+            # It also makes ties (img01 vs img1) deterministic instead of scandir order.
+            # A rescan (new/removed files, Reset, directory switch) starts over, so
+            # decodes prefetched from the previous listing are dropped as well
+            if clear_prefetch:
+                _clear_prefetch()
+            files = filter_files_by_patterns(directory, pattern)
+            files.sort()
+            files.sort(key=natural_sort_key)
+            files = _build_entries(directory, files)
+            _SORTED_CACHE[key] = (files, mtime)
+            _SORTED_CACHE.move_to_end(key)
+            while len(_SORTED_CACHE) > _SORTED_CACHE_SIZE:
+                _SORTED_CACHE.popitem(last=False)
+        else:
+            files = cached[0]
+            try:
+                _SORTED_CACHE.move_to_end(key)
+            except KeyError:
+                # Evicted by a concurrent VALIDATE_INPUTS scan; the listing is still valid
+                pass
+
+        return files, len(files)
+
     @classmethod
     def VALIDATE_INPUTS(
         cls,
@@ -101,6 +339,7 @@ class BatchImageLoader:
         error_handling: str = "Stop on error",
         custom_pattern: str = "*.png,*.jpg,*.jpeg,*.webp",
         start_index: int = 0,
+        prefetch_count: int = 4,
         # Hidden inputs (ComfyUI passes these to all class methods)
         prompt: dict = None,
         extra_pnginfo: dict = None,
@@ -116,11 +355,19 @@ class BatchImageLoader:
         if not directory or not directory.strip():
             return "Directory path is required"
 
-        if not os.path.isdir(directory):
+        # One stat both checks the directory and provides the cache mtime
+        try:
+            st = os.stat(directory)
+        except OSError:
+            return f"Directory does not exist: {directory}"
+        if not stat.S_ISDIR(st.st_mode):
             return f"Directory does not exist: {directory}"
 
+        # Shares the file list cache with load_image, so execution reuses this scan
         pattern = get_pattern_for_preset(filter_preset, custom_pattern)
-        files = filter_files_by_patterns(directory, pattern)
+        files, _ = cls._ensure_file_list(
+            _directory_info(directory)[0], pattern, mtime=st.st_mtime_ns
+        )
 
         if not files:
             return f"No images found matching pattern: {pattern}"
@@ -136,6 +383,7 @@ class BatchImageLoader:
         error_handling: str = "Stop on error",
         custom_pattern: str = "*.png,*.jpg,*.jpeg,*.webp",
         start_index: int = 0,
+        prefetch_count: int = 4,
         # Hidden inputs (ComfyUI passes these to all class methods)
         prompt: dict = None,
         extra_pnginfo: dict = None,
@@ -147,29 +395,39 @@ class BatchImageLoader:
 
         Returns a value that changes when inputs or internal state change.
         queue_nonce is injected by trigger_next_queue to bust ComfyUI's cache.
+        The value is a plain tuple: ComfyUI only compares and hashes it, so
+        there is no need to format it into a string.
         """
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"\n[BatchImageLoader] ===== IS_CHANGED called at {timestamp} =====")
+        if _DEBUG:
+            _dbg("\n[BatchImageLoader] ===== IS_CHANGED called at %s =====", time.strftime("%H:%M:%S"))
 
         if not directory:
-            print(f"[BatchImageLoader] IS_CHANGED: directory is empty, returning ''")
+            _dbg("[BatchImageLoader] IS_CHANGED: directory is empty, returning ''")
             return ""
 
         # Normalize directory to match load_image's normalization
-        import os
-        normalized_dir = os.path.normpath(directory)
+        normalized_dir = _directory_info(directory)[0]
+
+        # Re-queued executions carry a fresh nonce, which already makes the hash
+        # unique, so the iteration state only needs reading on the first queue
+        if queue_nonce:
+            return (normalized_dir, filter_preset, iteration_mode, queue_nonce)
+
         state = IterationState.get_state(normalized_dir)
         index = state.get('index', 0)
-        total = state.get('total_count', 0)
-        status = state.get('status', 'unknown')
 
         # queue_nonce changes each re-queue to bust ComfyUI's execution cache
-        hash_value = f"{normalized_dir}|{filter_preset}|{index}|{iteration_mode}|{queue_nonce}"
-
-        print(f"[BatchImageLoader] IS_CHANGED: dir={os.path.basename(normalized_dir)}, index={index}/{total}, status={status}")
-        print(f"[BatchImageLoader] IS_CHANGED: hash={hash_value[:80]}...")
-        print(f"[BatchImageLoader] IS_CHANGED: unique_id={unique_id}, queue_nonce={queue_nonce}")
+        hash_value = (normalized_dir, filter_preset, index, iteration_mode, queue_nonce)
+
+        _dbg(
+            "[BatchImageLoader] IS_CHANGED: dir=%s, index=%s/%s, status=%s",
+            os.path.basename(normalized_dir),
+            index,
+            state.get('total_count', 0),
+            state.get('status', 'unknown'),
+        )
+        _dbg("[BatchImageLoader] IS_CHANGED: hash=%s", hash_value)
+        _dbg("[BatchImageLoader] IS_CHANGED: unique_id=%s, queue_nonce=%s", unique_id, queue_nonce)
 
         return hash_value
 
@@ -181,6 +439,7 @@ class BatchImageLoader:
         error_handling: str = "Stop on error",
         custom_pattern: str = "*.png,*.jpg,*.jpeg,*.webp",
         start_index: int = 0,
+        prefetch_count: int = 4,
         # Hidden inputs (populated automatically by ComfyUI at runtime)
         prompt: dict = None,
         extra_pnginfo: dict = None,
@@ -197,6 +456,7 @@ class BatchImageLoader:
             error_handling: "Stop on error" or "Skip on error"
             custom_pattern: Custom glob pattern(s) when filter_preset is "Custom"
             start_index: Starting index for batch processing (0-based)
+            prefetch_count: Number of upcoming images to decode in the background
             prompt: Complete workflow dict (hidden input for re-queueing)
             extra_pnginfo: PNG metadata (hidden input for future use)
             unique_id: This node's ID (hidden input for future use)
@@ -204,75 +464,75 @@ class BatchImageLoader:
         Returns:
             Tuple of (image_tensor, total_count, index, filename, basename, input_directory_name, original_format, status, batch_complete)
         """
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"\n[BatchImageLoader] ===== load_image called at {timestamp} =====")
-        print(f"[BatchImageLoader] load_image: directory={directory}")
-        print(f"[BatchImageLoader] load_image: iteration_mode={iteration_mode}, unique_id={unique_id}")
-        print(f"[BatchImageLoader] load_image: prompt={'PRESENT (keys: ' + str(list(prompt.keys())[:5]) + '...)' if prompt else 'None'}")
+        if _DEBUG:
+            _dbg("\n[BatchImageLoader] ===== load_image called at %s =====", time.strftime("%H:%M:%S"))
+        _dbg("[BatchImageLoader] load_image: directory=%s", directory)
+        _dbg("[BatchImageLoader] load_image: iteration_mode=%s, unique_id=%s", iteration_mode, unique_id)
+        if _DEBUG:
+            _dbg("[BatchImageLoader] load_image: prompt=%s", 'PRESENT (keys: ' + str(list(prompt.keys())[:5]) + '...)' if prompt else 'None')
 
         # Normalize directory path for consistent state lookup
-        directory = os.path.normpath(directory)
+        directory = _directory_info(directory)[0]
 
-        # Get pattern and filter files
         pattern = get_pattern_for_preset(filter_preset, custom_pattern)
-        files = filter_files_by_patterns(directory, pattern)
-
-        # Sort files using natural sort
-        files = sorted(files, key=natural_sort_key)
 
-        total_count = len(files)
-        print(f"[BatchImageLoader] load_image: found {total_count} files matching pattern")
+        # Rescan the directory (bypassing the cache) on Reset or directory switch
+        force_rescan = iteration_mode == "Reset"
 
         # === STATE MANAGEMENT ===
 
-        # Get or initialize state for this directory
-        state = IterationState.get_state(directory)
-        print(f"[BatchImageLoader] load_image: initial state = index={state.get('index', 0)}, status={state.get('status', 'unknown')}")
+        # Read state once, apply this tick's updates to the working copy, and
+        # write them back together when the block exits
+        with IterationState.transaction(directory) as state:
+            _dbg("[BatchImageLoader] load_image: initial state = index=%s, status=%s", state.get('index', 0), state.get('status', 'unknown'))
 
-        # Check for directory change - if last_directory differs from current, reset
-        # This detects when user switches to a different folder
-        last_dir = IterationState.get_last_directory()
-        if last_dir is not None:
-            if IterationState.check_directory_change(directory, last_dir):
+            # Check for directory change - if last_directory differs from current, reset
+            # This detects when user switches to a different folder
+            last_dir = IterationState.get_last_directory()
+            if last_dir is not None and IterationState.check_directory_change(directory, last_dir):
                 # Switching to a different directory, reset its state
-                print(f"[BatchImageLoader] load_image: directory changed from {last_dir} to {directory}, resetting state")
-                IterationState.reset(directory)
-                state = IterationState.get_state(directory)
-
-        # Track current directory for next execution's change detection
-        IterationState.set_last_directory(directory)
-
-        # Handle iteration_mode
-        if iteration_mode == "Reset":
-            print(f"[BatchImageLoader] load_image: iteration_mode=Reset, resetting state")
-            IterationState.reset(directory)
-            state = IterationState.get_state(directory)
-
-        # Handle start_index: If start_index > 0 and state.index == 0, use start_index
-        if start_index > 0 and state["index"] == 0:
-            print(f"[BatchImageLoader] load_image: applying start_index={start_index}")
-            state["index"] = start_index
+                _dbg("[BatchImageLoader] load_image: directory changed from %s to %s, resetting state", last_dir, directory)
+                state["index"] = 0
+                state["status"] = "idle"
+                force_rescan = True
+
+            # Track current directory for next execution's change detection
+            IterationState.set_last_directory(directory)
+
+            # Handle iteration_mode
+            if iteration_mode == "Reset":
+                _dbg("[BatchImageLoader] load_image: iteration_mode=Reset, resetting state")
+                state["index"] = 0
+                state["status"] = "idle"
+
+            # Get filtered files in natural sort order (cached across queue ticks)
+            files, total_count = self._ensure_file_list(
+                directory, pattern, force_rescan=force_rescan, clear_prefetch=True
+            )
+            _dbg("[BatchImageLoader] load_image: found %s files matching pattern", total_count)
 
-        # Set total count for this batch
-        IterationState.set_total_count(directory, total_count)
+            # Handle start_index: If start_index > 0 and state.index == 0, use start_index
+            if start_index > 0 and state["index"] == 0:
+                _dbg("[BatchImageLoader] load_image: applying start_index=%s", start_index)
+                state["index"] = start_index
 
-        # Set status to processing at start
-        IterationState.set_status(directory, "processing")
+            # Set total count for this batch and mark it as processing
+            state["total_count"] = total_count
+            state["status"] = "processing"
 
-        # === PROCESSING FLOW ===
+            # === PROCESSING FLOW ===
 
-        # Get current index from state (0-based)
-        current_index = state["index"]
-        print(f"[BatchImageLoader] load_image: current_index={current_index} (before wraparound check)")
+            # Get current index from state (0-based)
+            current_index = state["index"]
+            _dbg("[BatchImageLoader] load_image: current_index=%s (before wraparound check)", current_index)
 
-        # Handle wraparound (in case index > total_count from previous run with more files)
-        if current_index >= total_count:
-            print(f"[BatchImageLoader] load_image: index {current_index} >= total {total_count}, wrapping to 0")
-            current_index = 0
-            state["index"] = 0
+            # Handle wraparound (in case index > total_count from previous run with more files)
+            if current_index >= total_count:
+                _dbg("[BatchImageLoader] load_image: index %s >= total %s, wrapping to 0", current_index, total_count)
+                current_index = 0
+                state["index"] = 0
 
-        print(f"[BatchImageLoader] load_image: will process index={current_index}, file={files[current_index] if files else 'N/A'}")
+        _dbg("[BatchImageLoader] load_image: will process index=%s, file=%s", current_index, files[current_index][0] if files else 'N/A')
 
         # Load image with error handling
         return self._load_with_error_handling(
@@ -284,111 +544,109 @@ class BatchImageLoader:
             skip_count=0,
             prompt=prompt,
             unique_id=unique_id,
+            prefetch_count=prefetch_count,
         )
 
     def _load_with_error_handling(
         self,
         directory: str,
-        files: list,
+        files: tuple,
         current_index: int,
         total_count: int,
         error_handling: str,
         skip_count: int,
         prompt: dict = None,
         unique_id: str = None,
+        prefetch_count: int = 4,
     ):
         """
         Load image at current index with error handling.
 
         Args:
             directory: Path to the image directory
-            files: Sorted list of filenames
+            files: Sorted (filename, basename, format, filepath) entries
             current_index: Current 0-based index
             total_count: Total number of files
             error_handling: "Stop on error" or "Skip on error"
             skip_count: Number of files skipped so far (for infinite loop protection)
             prompt: Complete workflow dict for re-queueing
             unique_id: Node ID for injecting queue_nonce
+            prefetch_count: Number of upcoming images to decode in the background
 
         Returns:
             Tuple of (image_tensor, total_count, index, filename, basename, input_directory_name, original_format, status, batch_complete)
         """
-        import time
-        print(f"\n[BatchImageLoader] ----- _load_with_error_handling -----")
-        print(f"[BatchImageLoader] Processing: index={current_index}/{total_count}, skip_count={skip_count}")
-
-        # Infinite loop protection
-        if skip_count >= total_count:
-            raise RuntimeError("Failed to load any images from directory - all files skipped or failed")
-
-        filename = files[current_index]
-        filepath = os.path.join(directory, filename)
-        print(f"[BatchImageLoader] Loading: {filename}")
-
-        try:
-            image_tensor = load_image_as_tensor(filepath)
-            print(f"[BatchImageLoader] Loaded successfully: shape={image_tensor.shape}")
-        except Exception as e:
-            print(f"[BatchImageLoader] ERROR loading {filename}: {e}")
-            if error_handling == "Stop on error":
-                raise RuntimeError(f"Failed to load image {filename}: {e}") from e
-            else:
+        _dbg("\n[BatchImageLoader] ----- _load_with_error_handling -----")
+        _dbg("[BatchImageLoader] Processing: index=%s/%s, skip_count=%s", current_index, total_count, skip_count)
+
+        # Start decoding upcoming images before the synchronous load below, so they
+        # decode in parallel with this one and with downstream processing
+        if files:
+            upcoming = files[current_index + 1 : current_index + 1 + prefetch_count]
+            _schedule_prefetch(files[current_index][3], [entry[3] for entry in upcoming])
+
+        # Skip on error advances through files until one loads; skip_count
+        # bounds the loop so a directory of unreadable files can't spin forever
+        while True:
+            if skip_count >= total_count:
+                raise RuntimeError("Failed to load any images from directory - all files skipped or failed")
+
+            filename, basename, original_format, filepath = files[current_index]
+            _dbg("[BatchImageLoader] Loading: %s", filename)
+
+            try:
+                image_tensor = _load_tensor(filepath)
+                if _DEBUG:
+                    _dbg("[BatchImageLoader] Loaded successfully: shape=%s", image_tensor.shape)
+                break
+            except Exception as e:
+                print(f"[BatchImageLoader] ERROR loading {filename}: {e}")
+                if error_handling == "Stop on error":
+                    raise RuntimeError(f"Failed to load image {filename}: {e}") from e
                 # Skip on error: advance index and try next image
-                print(f"[BatchImageLoader] Skipping failed image, advancing to next")
+                _dbg("[BatchImageLoader] Skipping failed image, advancing to next")
                 IterationState.advance(directory)
-                next_index = (current_index + 1) % total_count
-                return self._load_with_error_handling(
-                    directory=directory,
-                    files=files,
-                    current_index=next_index,
-                    total_count=total_count,
-                    error_handling=error_handling,
-                    skip_count=skip_count + 1,
-                    prompt=prompt,
-                    unique_id=unique_id,
-                )
-
-        # Success - extract basename (filename without extension) and format
-        basename, ext = os.path.splitext(filename)
-        # Get original format without the dot (e.g., "png", "jpg")
-        original_format = ext[1:].lower() if ext else "png"
+                current_index = (current_index + 1) % total_count
+                skip_count += 1
 
+        # Success - basename and format were derived when the listing was built
         # Extract just the folder name from directory path
-        input_directory_name = os.path.basename(directory.rstrip(os.sep))
-        print(f"[BatchImageLoader] basename={basename}, format={original_format}, dir_name={input_directory_name}")
+        input_directory_name = _directory_info(directory)[1]
+        _dbg("[BatchImageLoader] basename=%s, format=%s, dir_name=%s", basename, original_format, input_directory_name)
 
         # Determine if this is the last image
         batch_complete = current_index >= total_count - 1
 
         # Queue control based on batch_complete
-        print(f"\n[BatchImageLoader] ===== QUEUE CONTROL =====")
-        print(f"[BatchImageLoader] index={current_index}, total={total_count}, batch_complete={batch_complete}")
+        _dbg("\n[BatchImageLoader] ===== QUEUE CONTROL =====")
+        _dbg("[BatchImageLoader] index=%s, total=%s, batch_complete=%s", current_index, total_count, batch_complete)
 
         if batch_complete:
             # Stop Auto Queue and reset for re-run
-            print(f"[BatchImageLoader] BATCH COMPLETE - stopping auto queue")
+            _dbg("[BatchImageLoader] BATCH COMPLETE - stopping auto queue")
             stop_auto_queue()
             IterationState.wrap_index(directory)
             status = "completed"
             IterationState.set_status(directory, "completed")
-            print(f"[BatchImageLoader] Wrapped index to 0 for next batch run")
+            _dbg("[BatchImageLoader] Wrapped index to 0 for next batch run")
         else:
             status = "processing"
             # Advance index BEFORE triggering next queue to avoid race condition
             old_index = IterationState.get_state(directory).get('index', 0)
             IterationState.advance(directory)
             new_index = IterationState.get_state(directory).get('index', 0)
-            print(f"[BatchImageLoader] Advanced index: {old_index} -> {new_index}")
+            _dbg("[BatchImageLoader] Advanced index: %s -> %s", old_index, new_index)
 
             # Now trigger next queue with updated state
-            print(f"[BatchImageLoader] Triggering next queue...")
-            print(f"[BatchImageLoader] prompt is {'PRESENT' if prompt else 'None'}, unique_id={unique_id}")
+            _dbg("[BatchImageLoader] Triggering next queue...")
+            _dbg("[BatchImageLoader] prompt is %s, unique_id=%s", 'PRESENT' if prompt else 'None', unique_id)
             queue_result = trigger_next_queue(prompt, unique_id=unique_id)
-            print(f"[BatchImageLoader] trigger_next_queue returned: {queue_result}")
+            _dbg("[BatchImageLoader] trigger_next_queue returned: %s", queue_result)
 
-        print(f"[BatchImageLoader] ===== RETURNING =====")
-        print(f"[BatchImageLoader] status={status}, batch_complete={batch_complete}")
-        print(f"[BatchImageLoader] Outputs: IMAGE={image_tensor.shape}, INPUT_DIRECTORY={input_directory_name}, INPUT_BASE_NAME={basename}, INPUT_FILE_TYPE={original_format}, FILENAME={filename}, INDEX={current_index}, TOTAL_COUNT={total_count}, STATUS={status}, BATCH_COMPLETE={batch_complete}")
+        _dbg("[BatchImageLoader] ===== RETURNING =====")
+        _dbg("[BatchImageLoader] status=%s, batch_complete=%s", status, batch_complete)
+        if _DEBUG:
+            _dbg("[BatchImageLoader] Outputs: IMAGE=%s, INPUT_DIRECTORY=%s, INPUT_BASE_NAME=%s, INPUT_FILE_TYPE=%s, FILENAME=%s, INDEX=%s, TOTAL_COUNT=%s, STATUS=%s, BATCH_COMPLETE=%s", image_tensor.shape, input_directory_name, basename, original_format, filename, current_index, total_count, status, batch_complete)
 
         # Broadcast INDEX/TOTAL_COUNT update to ALL connected clients (fixes batch iteration UI updates)
         if HAS_SERVER and PromptServer is not None and PromptServer.instance is not None and unique_id is not None:
@@ -405,7 +663,7 @@ class BatchImageLoader:
                 },
                 sid=None  # Broadcast to ALL clients
             )
-            print(f"[BatchImageLoader] Broadcast 'executed' event to all clients for node {unique_id}")
+            _dbg("[BatchImageLoader] Broadcast 'executed' event to all clients for node %s", unique_id)
 
         # Return order matches RETURN_NAMES for clean wiring to BatchImageSaver
         return (image_tensor, input_directory_name, basename, original_format, filename, current_index, total_count, status, batch_complete)
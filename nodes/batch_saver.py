@@ -1,7 +1,11 @@
 """BatchImageSaver node for ComfyUI batch image processing."""
 
+import functools
+import itertools
 import os
-import random
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from ..utils.save_image_utils import (
     construct_filename,
@@ -25,6 +29,154 @@ except ImportError:
     PromptServer = None
     HAS_SERVER = False
 
+# Verbose per-save tracing, off by default (set BATCH_SAVER_DEBUG=1 to enable)
+_DEBUG = bool(os.environ.get("BATCH_SAVER_DEBUG"))
+
+
+def _dbg(msg: str, *args) -> None:
+    """Print diagnostic output only when BATCH_SAVER_DEBUG is set.
+
+    Arguments are %-formatted lazily, so nothing is formatted when tracing
+    is off.
+    """
+    if _DEBUG:
+        print(msg % args if args else msg)
+
+
+@functools.lru_cache(maxsize=32)
+def _ui_subfolder(save_dir: str, comfy_output: str) -> str:
+    """Compute the preview subfolder of save_dir relative to ComfyUI's output.
+
+    A batch writes every image into the same directory, so the relpath is
+    computed once per (save_dir, comfy_output) pair.
+
+    Args:
+        save_dir: Directory the image was saved to (dirname of the final path)
+        comfy_output: ComfyUI output directory
+
+    Returns:
+        Relative subfolder, or "" for the output root or an unrelated drive
+    """
+    try:
+        subfolder = os.path.relpath(save_dir, comfy_output)
+    except ValueError:
+        # Happens on Windows if paths are on different drives
+        return ""
+    return "" if subfolder == "." else subfolder
+
+
+# Fallback names when no output_base_name is wired: a per-process start stamp
+# keeps names from colliding with earlier sessions, and a counter keeps them
+# unique within this one (output_20250101_120000_000001, ...)
+_FALLBACK_PREFIX = f"output_{time.strftime('%Y%m%d_%H%M%S')}_"
+_FALLBACK_COUNTER = itertools.count(1)
+
+# Background encode/write pool for async_save. PIL releases the GIL while
+# encoding, so the next queue iteration can run while images are written.
+# final path -> Future[None]; drained on batch completion or when a later
+# save needs an accurate view of the output directory.
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="batch_save")
+_PENDING_SAVES: dict[str, Future] = {}
+
+# Each queued save holds a decoded PIL image, so the number in flight is capped
+_MAX_PENDING_SAVES = 8
+
+
+def _wait_for_save(filepath: str) -> None:
+    """Block until a pending background save of filepath has finished.
+
+    Args:
+        filepath: Output path that may have a write in flight
+
+    Raises:
+        Any exception raised by the background save
+    """
+    future = _PENDING_SAVES.pop(filepath, None)
+    if future is not None:
+        future.result()
+
+
+def _reap_saves() -> None:
+    """Drop finished background saves and block while too many are in flight.
+
+    Keeps _PENDING_SAVES bounded when batch_complete is never wired, and
+    surfaces failed writes on the next save instead of never.
+
+    Raises:
+        The first exception raised by a finished background save
+    """
+    error = None
+    for filepath, future in list(_PENDING_SAVES.items()):
+        if future.done():
+            del _PENDING_SAVES[filepath]
+            error = error or future.exception()
+    while len(_PENDING_SAVES) >= _MAX_PENDING_SAVES:
+        # dicts keep insertion order, so this waits on the oldest save
+        future = _PENDING_SAVES.pop(next(iter(_PENDING_SAVES)))
+        try:
+            future.result()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+
+# batch_preview/async_save: unique_id -> UI image entries saved so far in the
+# current batch. async_save buffers too, so no preview points at a file that
+# has not been written yet.
+# Bounded so an unwired batch_complete or an interrupted batch cannot grow it
+# forever; only the most recent entries are kept.
+_MAX_BATCH_PREVIEWS = 256
+_PENDING_PREVIEWS: dict[str | None, deque[dict]] = {}
+
+
+def _collect_previews(
+    unique_id: str | None,
+    ui_image: dict | None,
+    batch_complete: bool,
+    batch_index: int | None = None,
+) -> list[dict]:
+    """Buffer a preview entry and release the whole batch on its last image.
+
+    Args:
+        unique_id: Node ID the previews belong to
+        ui_image: Preview entry for this save, or None if nothing was saved
+        batch_complete: Whether this is the last image of the batch
+        batch_index: 0-based index of the image in its batch, if wired; index 0
+                     drops previews left over from an unfinished batch
+
+    Returns:
+        Preview entries to show now (empty until the batch completes)
+    """
+    if batch_index == 0:
+        _PENDING_PREVIEWS.pop(unique_id, None)
+    pending = _PENDING_PREVIEWS.setdefault(unique_id, deque(maxlen=_MAX_BATCH_PREVIEWS))
+    if ui_image is not None:
+        pending.append(ui_image)
+    if batch_complete:
+        return list(_PENDING_PREVIEWS.pop(unique_id))
+    return []
+
+
+def flush_pending_saves() -> None:
+    """Wait for all background saves to finish.
+
+    Every pending save is drained even if one fails; the first error is
+    re-raised afterwards.
+
+    Raises:
+        The first exception raised by a background save
+    """
+    error = None
+    while _PENDING_SAVES:
+        future = _PENDING_SAVES.pop(next(iter(_PENDING_SAVES)))
+        try:
+            future.result()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
 
 class BatchImageSaver:
     """
@@ -42,7 +194,11 @@ class BatchImageSaver:
     OUTPUT_NODE = True
 
     def __init__(self):
-        """Initialize the saver with default output directory."""
+        """Initialize the saver with default output directory.
+
+        The ComfyUI output directory is fixed at startup, so it is looked up
+        once here and reused by every save this node instance performs.
+        """
         self.output_dir = folder_paths.get_output_directory() if folder_paths else ""
 
     @classmethod
@@ -103,6 +259,56 @@ class BatchImageSaver:
                         "tooltip": "Suffix for output filename (include separators)",
                     },
                 ),
+                "png_compress_level": (
+                    "INT",
+                    {
+                        "default": 4,
+                        "min": 0,
+                        "max": 9,
+                        "step": 1,
+                        "tooltip": "PNG compression 0-9. Lower saves faster but larger (1 is several times faster than 6).",
+                    },
+                ),
+                "optimize": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Smaller PNG/JPG files at a large encode-time cost (PNG often ~10x slower).",
+                    },
+                ),
+                "batch_preview": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Show all previews once when BATCH_COMPLETE is true "
+                        "instead of sending one UI update per image.",
+                    },
+                ),
+                "async_save": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Encode and write in the background so the next image can start. "
+                        "Pending writes finish when BATCH_COMPLETE is true; previews are held until then, "
+                        "and SAVED_PATH may name a file that is not written yet.",
+                    },
+                ),
+                "batch_index": (
+                    "INT",
+                    {
+                        "default": 0,
+                        "forceInput": True,
+                        "tooltip": "Wire from INDEX. Index 0 discards previews left from an unfinished batch.",
+                    },
+                ),
+                "batch_complete": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "forceInput": True,
+                        "tooltip": "Wire from BATCH_COMPLETE. Waits for background saves on the last image.",
+                    },
+                ),
             },
             "hidden": {
                 "unique_id": "UNIQUE_ID",
@@ -119,6 +325,12 @@ class BatchImageSaver:
         output_file_type="png",
         filename_prefix="",
         filename_suffix="",
+        png_compress_level=4,
+        optimize=False,
+        batch_preview=False,
+        async_save=False,
+        batch_index=None,
+        batch_complete=False,
         unique_id=None,
     ):
         """
@@ -133,111 +345,140 @@ class BatchImageSaver:
             output_file_type: Output file extension (png, jpg, jpeg, webp)
             filename_prefix: Prefix for filename (include separators)
             filename_suffix: Suffix for filename (include separators)
+            png_compress_level: zlib compression level for PNG output (0-9)
+            optimize: Enable encoder optimization passes for PNG/JPG
+            batch_preview: Buffer previews and return them all on the last image
+            async_save: Encode and write in a background thread; previews are
+                        buffered until batch_complete flushes the writes
+            batch_index: 0-based index from the loader; 0 starts a fresh preview buffer
+            batch_complete: Last image of the batch; waits for background saves
+                            and releases buffered previews
 
         Returns:
             Dict with UI images for ComfyUI preview
         """
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"\n[BatchImageSaver] ===== save_image called at {timestamp} =====")
-        print(f"[BatchImageSaver] Inputs:")
-        print(f"[BatchImageSaver]   image shape: {image.shape if hasattr(image, 'shape') else 'unknown'}")
-        print(f"[BatchImageSaver]   quality: {quality}")
-        print(f"[BatchImageSaver]   overwrite_mode: '{overwrite_mode}'")
-        print(f"[BatchImageSaver]   output_directory: '{output_directory}'")
-        print(f"[BatchImageSaver]   output_base_name: '{output_base_name}'")
-        print(f"[BatchImageSaver]   output_file_type: '{output_file_type}'")
-        print(f"[BatchImageSaver]   filename_prefix: '{filename_prefix}'")
-        print(f"[BatchImageSaver]   filename_suffix: '{filename_suffix}'")
+        if _DEBUG:
+            _dbg("\n[BatchImageSaver] ===== save_image called at %s =====", time.strftime("%H:%M:%S"))
+            _dbg("[BatchImageSaver] Inputs:")
+            _dbg("[BatchImageSaver]   image shape: %s", image.shape if hasattr(image, 'shape') else 'unknown')
+            _dbg("[BatchImageSaver]   quality: %s", quality)
+            _dbg("[BatchImageSaver]   overwrite_mode: '%s'", overwrite_mode)
+            _dbg("[BatchImageSaver]   output_directory: '%s'", output_directory)
+            _dbg("[BatchImageSaver]   output_base_name: '%s'", output_base_name)
+            _dbg("[BatchImageSaver]   output_file_type: '%s'", output_file_type)
+            _dbg("[BatchImageSaver]   filename_prefix: '%s'", filename_prefix)
+            _dbg("[BatchImageSaver]   filename_suffix: '%s'", filename_suffix)
 
         # 1. Determine output format
         extension = output_file_type.lower().strip() if output_file_type else "png"
-        print(f"[BatchImageSaver] Using extension: '{extension}'")
+        _dbg("[BatchImageSaver] Using extension: '%s'", extension)
 
         # 2. Determine base filename
         if output_base_name and output_base_name.strip():
             basename = output_base_name.strip()
         else:
-            # Generate fallback filename with random suffix
-            basename = f"output_{random.randint(1000, 9999)}"
+            # Generate unique fallback filename
+            basename = f"{_FALLBACK_PREFIX}{next(_FALLBACK_COUNTER):06d}"
             print(f"[BatchImageSaver] WARNING: No output_base_name provided, using fallback: '{basename}'")
-        print(f"[BatchImageSaver] basename: '{basename}'")
+        _dbg("[BatchImageSaver] basename: '%s'", basename)
 
         # 3. Construct output path
         def get_default_output():
             if folder_paths:
-                default_dir = folder_paths.get_output_directory()
-                print(f"[BatchImageSaver] folder_paths.get_output_directory() = '{default_dir}'")
-                return default_dir
-            print(f"[BatchImageSaver] WARNING: folder_paths not available")
+                _dbg("[BatchImageSaver] ComfyUI output directory = '%s'", self.output_dir)
+                return self.output_dir
+            _dbg("[BatchImageSaver] WARNING: folder_paths not available")
             return ""
 
         output_dir = resolve_output_directory(
             output_directory, "", get_default_output
         )
-        print(f"[BatchImageSaver] Resolved output_dir: '{output_dir}'")
+        _dbg("[BatchImageSaver] Resolved output_dir: '%s'", output_dir)
 
         filename = construct_filename(basename, filename_prefix, filename_suffix, extension)
         filepath = os.path.join(output_dir, filename)
-        print(f"[BatchImageSaver] Full filepath: '{filepath}'")
+        _dbg("[BatchImageSaver] Full filepath: '%s'", filepath)
 
         # 4. Handle existing file
+        # Skip/Rename decide based on what is on disk, so pending writes must land first
+        if overwrite_mode == "Overwrite":
+            _reap_saves()
+            _wait_for_save(filepath)
+        else:
+            flush_pending_saves()
         final_path, should_save = handle_existing_file(filepath, overwrite_mode)
-        print(f"[BatchImageSaver] handle_existing_file: final_path='{final_path}', should_save={should_save}")
+        _dbg("[BatchImageSaver] handle_existing_file: final_path='%s', should_save=%s", final_path, should_save)
 
         if not should_save:
             # Skip mode - file exists and user chose to skip
-            print(f"[BatchImageSaver] SKIPPING save (file exists, skip mode)")
-            return {"ui": {"images": []}, "result": (image, "", "")}
+            _dbg("[BatchImageSaver] SKIPPING save (file exists, skip mode)")
+            ui_images = _collect_previews(unique_id, None, batch_complete, batch_index) if batch_preview or async_save else []
+            return {"ui": {"images": ui_images}, "result": (image, "", "")}
 
         # 5. Convert and save
-        print(f"[BatchImageSaver] Converting tensor to PIL image...")
+        _dbg("[BatchImageSaver] Converting tensor to PIL image...")
         pil_img = tensor_to_pil(image)
-        print(f"[BatchImageSaver] PIL image size: {pil_img.size}, mode: {pil_img.mode}")
+        _dbg("[BatchImageSaver] PIL image size: %s, mode: %s", pil_img.size, pil_img.mode)
 
-        print(f"[BatchImageSaver] Saving with format '{extension.upper()}', quality={quality}...")
-        save_with_format(pil_img, final_path, extension.upper(), quality)
-        print(f"[BatchImageSaver] SAVED: {final_path}")
-
-        # Verify file was created
-        if os.path.exists(final_path):
-            file_size = os.path.getsize(final_path)
-            print(f"[BatchImageSaver] File verified: {file_size} bytes")
+        image_format = extension.upper()
+        _dbg("[BatchImageSaver] Saving with format '%s', quality=%s...", image_format, quality)
+        if async_save:
+            # uint8 input shares the tensor's memory; copy so an upstream
+            # in-place edit cannot change bytes still waiting to be written
+            _PENDING_SAVES[final_path] = _SAVE_POOL.submit(
+                save_with_format,
+                pil_img.copy(),
+                final_path,
+                image_format,
+                quality,
+                optimize,
+                png_compress_level,
+            )
+            _dbg("[BatchImageSaver] QUEUED: %s", final_path)
         else:
-            print(f"[BatchImageSaver] ERROR: File was NOT created!")
+            save_with_format(
+                pil_img, final_path, image_format, quality, optimize, png_compress_level
+            )
+            _dbg("[BatchImageSaver] SAVED: %s", final_path)
+
+            # Verify file was created (extra stat calls, so only when tracing)
+            if _DEBUG:
+                if os.path.exists(final_path):
+                    _dbg("[BatchImageSaver] File verified: %s bytes", os.path.getsize(final_path))
+                else:
+                    _dbg("[BatchImageSaver] ERROR: File was NOT created!")
+
+        # Last image of the batch: make sure every background write has landed
+        if batch_complete:
+            flush_pending_saves()
 
         # 6. Return UI dict
         # Calculate subfolder relative to ComfyUI output directory
-        if folder_paths:
-            try:
-                comfy_output = folder_paths.get_output_directory()
-                subfolder = os.path.relpath(os.path.dirname(final_path), comfy_output)
-                if subfolder == ".":
-                    subfolder = ""
-            except ValueError:
-                # Happens on Windows if paths are on different drives
-                subfolder = ""
-        else:
-            subfolder = ""
+        # Use the saved file's own directory: a prefix/suffix containing a
+        # separator (e.g. "upscaled/") writes below output_dir
+        subfolder = _ui_subfolder(os.path.dirname(final_path), self.output_dir) if folder_paths else ""
 
         saved_filename = os.path.basename(final_path)
         saved_path = final_path
 
+        ui_image = {
+            "filename": saved_filename,
+            "subfolder": subfolder,
+            "type": "output",
+        }
+        # A queued save may not be on disk yet, so its preview waits for the flush
+        if batch_preview or async_save:
+            ui_images = _collect_previews(unique_id, ui_image, batch_complete, batch_index)
+        else:
+            ui_images = [ui_image]
+
         result = {
-            "ui": {
-                "images": [
-                    {
-                        "filename": saved_filename,
-                        "subfolder": subfolder,
-                        "type": "output",
-                    }
-                ]
-            },
+            "ui": {"images": ui_images},
             "result": (image, saved_filename, saved_path)
         }
 
         # Broadcast UI update to ALL connected clients (fixes batch iteration UI updates)
-        if HAS_SERVER and PromptServer is not None and PromptServer.instance is not None and unique_id is not None:
+        if HAS_SERVER and PromptServer is not None and PromptServer.instance is not None and unique_id is not None and ui_images:
             PromptServer.instance.send_sync(
                 "executed",
                 {
@@ -246,9 +487,9 @@ class BatchImageSaver:
                 },
                 sid=None  # Broadcast to ALL clients
             )
-            print(f"[BatchImageSaver] Broadcast 'executed' event to all clients for node {unique_id}")
+            _dbg("[BatchImageSaver] Broadcast 'executed' event to all clients for node %s", unique_id)
 
-        print(f"[BatchImageSaver] Returning UI result: {result}")
-        print(f"[BatchImageSaver] ===== save_image complete =====\n")
+        _dbg("[BatchImageSaver] Returning UI result: %s", result)
+        _dbg("[BatchImageSaver] ===== save_image complete =====\n")
 
         return result
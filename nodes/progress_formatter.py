@@ -23,6 +23,12 @@ class BatchProgressFormatter:
     FUNCTION = "format_progress"
     OUTPUT_NODE = True  # Required for UI updates to display
 
+    def __init__(self):
+        """Initialize broadcast de-duplication state."""
+        # (unique_id, total, percentage) of the last broadcast; ComfyUI reuses
+        # the node instance across queued executions of the same workflow
+        self._last_broadcast = None
+
     @classmethod
     def INPUT_TYPES(cls):
         return {
@@ -69,14 +75,29 @@ class BatchProgressFormatter:
         # Protect against divide-by-zero
         safe_total = max(1, total_count)
 
-        # Calculate percentage (integer, no decimals - uses int() which truncates)
-        percentage = int((current / safe_total) * 100)
+        # Calculate percentage (integer, no decimals - floor division truncates).
+        # Pure integer math avoids float error: int(29 / 100 * 100) is 28
+        percentage = (current * 100) // safe_total
 
         # Format: "3 of 10 (30%)"
         progress_text = f"{current} of {safe_total} ({percentage}%)"
 
-        # Broadcast progress update to ALL connected clients
-        if HAS_SERVER and PromptServer is not None and PromptServer.instance is not None and unique_id is not None:
+        # Broadcast progress update to ALL connected clients. Long batches map
+        # many consecutive images to the same percentage; skip those repeats,
+        # but always send the first and last image so the UI starts and ends
+        # on the exact count
+        broadcast_key = (unique_id, safe_total, percentage)
+        is_repeat = (
+            broadcast_key == self._last_broadcast and 1 < current < safe_total
+        )
+        if (
+            HAS_SERVER
+            and PromptServer is not None
+            and PromptServer.instance is not None
+            and unique_id is not None
+            and not is_repeat
+        ):
+            self._last_broadcast = broadcast_key
             PromptServer.instance.send_sync(
                 "executed",
                 {
@@ -1,5 +1,7 @@
 """Pytest fixtures for ComfyUI batch image processing tests."""
 
+import functools
+import io
 import os
 import tempfile
 
@@ -7,6 +9,23 @@ import pytest
 from PIL import Image
 
 
+@functools.lru_cache(maxsize=None)
+def _png_bytes(size: int, color: str) -> bytes:
+    """Encode a solid-color square PNG once per process.
+
+    compress_level=0 skips deflate; the files are tiny and only ever decoded.
+    """
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), color=color).save(buffer, format="PNG", compress_level=0)
+    return buffer.getvalue()
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write pre-encoded image bytes to path."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
 @pytest.fixture
 def temp_image_dir():
     """
@@ -39,13 +58,18 @@ def temp_image_dir():
         yield tmpdir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def temp_real_image_dir():
     """
     Create a temporary directory with actual image files.
 
     Creates real PNG images (100x100 solid colors) for testing
     image loading functionality. Named to test natural sort order.
+
+    Session-scoped: tests only read this directory (iteration state and the
+    loader's caches are reset per test), so it is built once per run. Tests
+    that need to modify a directory must create their own. Under pytest-xdist
+    each worker process builds its own copy.
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         # Create real images with names that test natural sort
@@ -55,21 +79,27 @@ def temp_real_image_dir():
             ("img10.png", "blue"),
         ]
         for filename, color in images:
-            filepath = os.path.join(tmpdir, filename)
-            img = Image.new("RGB", (100, 100), color=color)
-            img.save(filepath)
+            _write_bytes(os.path.join(tmpdir, filename), _png_bytes(100, color))
 
         yield tmpdir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def temp_real_image_dir_normalized(temp_real_image_dir):
+    """temp_real_image_dir as the loader keys it (os.path.normpath applied)."""
+    return os.path.normpath(temp_real_image_dir)
+
+
+@pytest.fixture(scope="session")
 def temp_mixed_image_dir():
     """
     Create a temp directory with mixed image types and a non-image file.
+
+    Session-scoped and read-only, like temp_real_image_dir.
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         # Real images
-        Image.new("RGB", (50, 50), color="red").save(os.path.join(tmpdir, "test1.png"))
+        _write_bytes(os.path.join(tmpdir, "test1.png"), _png_bytes(50, "red"))
         Image.new("RGB", (50, 50), color="blue").save(os.path.join(tmpdir, "test2.jpg"))
 
         # Non-image file
@@ -79,6 +109,33 @@ def temp_mixed_image_dir():
         yield tmpdir
 
 
+@pytest.fixture(scope="session")
+def corrupt_only_dir():
+    """Temp directory whose only "images" are unreadable (a.png, b.png).
+
+    Session-scoped and read-only, like temp_real_image_dir.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ["a.png", "b.png"]:
+            _write_bytes(os.path.join(tmpdir, name), b"not an image")
+
+        yield tmpdir
+
+
+@pytest.fixture(scope="session")
+def corrupt_and_valid_dir():
+    """Temp directory with a corrupt file sorting before a valid one.
+
+    Contains aaa_corrupt.png and bbb_valid.png (a 1x1 PNG). Session-scoped
+    and read-only, like temp_real_image_dir.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_bytes(os.path.join(tmpdir, "aaa_corrupt.png"), b"not an image")
+        _write_bytes(os.path.join(tmpdir, "bbb_valid.png"), _png_bytes(1, "green"))
+
+        yield tmpdir
+
+
 @pytest.fixture
 def comfyui_mock():
     """
@@ -92,7 +149,10 @@ def comfyui_mock():
 
 
 @pytest.fixture
-def temp_output_dir():
-    """Create a temporary output directory for save tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_output_dir(tmp_path):
+    """Create a temporary output directory for save tests.
+
+    Uses pytest's per-test subdirectory of the session base temp dir, which
+    is cleaned up in bulk by pytest rather than removed after every test.
+    """
+    return str(tmp_path)
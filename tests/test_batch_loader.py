@@ -1,6 +1,7 @@
 """Tests for BatchImageLoader node."""
 
 import os
+import sys
 import tempfile
 from unittest import mock
 from unittest.mock import patch
@@ -12,25 +13,64 @@ from PIL import Image
 # Import BatchImageLoader through the root package (as ComfyUI would)
 # This is necessary because batch_loader.py uses relative imports like ..utils
 from comfyui_batch_image_processing import NODE_CLASS_MAPPINGS
+from comfyui_batch_image_processing.nodes.batch_loader import clear_file_cache
 from comfyui_batch_image_processing.utils.iteration_state import IterationState
 
 BatchImageLoader = NODE_CLASS_MAPPINGS["BatchImageLoader"]
 
+# Minimal valid 1x1 green RGB PNG, for tests that only need a loadable file
+VALID_PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02"
+    b"\x00\x00\x00\x90wS\xde\x00\x00\x00\x0fIDATx\x01\x01\x04\x00\xfb\xff\x00\x00"
+    b"\x80\x00\x01\x04\x00\x81.\xfd3\xfd\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def write_valid_png(path: str) -> None:
+    """Write VALID_PNG_BYTES to path."""
+    with open(path, "wb") as f:
+        f.write(VALID_PNG_BYTES)
+
 
 @pytest.fixture(autouse=True)
 def clear_iteration_state():
-    """Clear iteration state before and after each test."""
+    """Clear iteration state and file list cache before and after each test."""
     IterationState.clear_all()
+    clear_file_cache()
     yield
     IterationState.clear_all()
+    clear_file_cache()
+
+
+@pytest.fixture
+def loader():
+    """A BatchImageLoader node instance."""
+    return BatchImageLoader()
+
+
+@pytest.fixture
+def fast_decode(monkeypatch):
+    """Skip PNG decode for tests that only check metadata outputs.
+
+    Every load returns the same 1x1 black tensor, including prefetched ones.
+    """
+    import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+    fake = torch.zeros((1, 1, 1, 3))
+    monkeypatch.setattr(batch_loader_module, "_decode_image", lambda filepath: fake)
 
 
 class TestInputTypes:
     """Tests for INPUT_TYPES class method."""
 
-    def test_returns_dict_with_required_optional_and_hidden(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def result(cls):
+        """INPUT_TYPES output, built once for the class's read-only checks."""
+        return BatchImageLoader.INPUT_TYPES()
+
+    def test_returns_dict_with_required_optional_and_hidden(self, result):
         """INPUT_TYPES returns dict with required, optional, and hidden keys."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert isinstance(result, dict)
         assert "required" in result
         assert "optional" in result
@@ -40,16 +80,14 @@ class TestInputTypes:
         assert "extra_pnginfo" in result["hidden"]
         assert "unique_id" in result["hidden"]
 
-    def test_directory_is_required_string(self):
+    def test_directory_is_required_string(self, result):
         """Directory input is a required STRING type."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "directory" in result["required"]
         directory_config = result["required"]["directory"]
         assert directory_config[0] == "STRING"
 
-    def test_filter_preset_is_combo(self):
+    def test_filter_preset_is_combo(self, result):
         """Filter preset is a combo box with expected options."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "filter_preset" in result["required"]
         preset_options = result["required"]["filter_preset"][0]
         assert "All Images" in preset_options
@@ -57,30 +95,33 @@ class TestInputTypes:
         assert "JPG Only" in preset_options
         assert "Custom" in preset_options
 
-    def test_custom_pattern_is_optional(self):
+    def test_custom_pattern_is_optional(self, result):
         """Custom pattern is an optional STRING."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "custom_pattern" in result["optional"]
 
-    def test_iteration_mode_is_required(self):
+    def test_iteration_mode_is_required(self, result):
         """Iteration mode is a required combo with Continue/Reset options."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "iteration_mode" in result["required"]
         mode_options = result["required"]["iteration_mode"][0]
         assert "Continue" in mode_options
         assert "Reset" in mode_options
 
-    def test_error_handling_is_required(self):
+    def test_error_handling_is_required(self, result):
         """Error handling is a required combo with Stop/Skip options."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "error_handling" in result["required"]
         error_options = result["required"]["error_handling"][0]
         assert "Stop on error" in error_options
         assert "Skip on error" in error_options
 
-    def test_start_index_is_optional(self):
+    def test_prefetch_count_is_optional(self, result):
+        """Prefetch count is an optional INT that can be disabled with 0."""
+        assert "prefetch_count" in result["optional"]
+        prefetch_config = result["optional"]["prefetch_count"]
+        assert prefetch_config[0] == "INT"
+        assert prefetch_config[1]["min"] == 0
+
+    def test_start_index_is_optional(self, result):
         """Start index is an optional INT."""
-        result = BatchImageLoader.INPUT_TYPES()
         assert "start_index" in result["optional"]
         start_config = result["optional"]["start_index"]
         assert start_config[0] == "INT"
@@ -89,27 +130,37 @@ class TestInputTypes:
 class TestValidateInputs:
     """Tests for VALIDATE_INPUTS class method."""
 
+    validate = staticmethod(BatchImageLoader.VALIDATE_INPUTS)
+
     def test_empty_directory_returns_error(self):
         """Empty directory returns error string."""
-        result = BatchImageLoader.VALIDATE_INPUTS("", "All Images")
+        result = self.validate("", "All Images")
         assert isinstance(result, str)
         assert "required" in result.lower() or "Directory" in result
 
     def test_whitespace_directory_returns_error(self):
         """Whitespace-only directory returns error string."""
-        result = BatchImageLoader.VALIDATE_INPUTS("   ", "All Images")
+        result = self.validate("   ", "All Images")
         assert isinstance(result, str)
         assert "required" in result.lower() or "Directory" in result
 
     def test_nonexistent_directory_returns_error(self):
         """Nonexistent directory returns error string with path."""
-        result = BatchImageLoader.VALIDATE_INPUTS("/nonexistent/path", "All Images")
+        result = self.validate("/nonexistent/path", "All Images")
         assert isinstance(result, str)
         assert "not exist" in result.lower() or "nonexistent" in result.lower()
 
+    def test_file_path_returns_error(self, temp_real_image_dir):
+        """A path to a file rather than a directory returns error string."""
+        result = self.validate(
+            os.path.join(temp_real_image_dir, "img1.png"), "All Images"
+        )
+        assert isinstance(result, str)
+        assert "not exist" in result.lower()
+
     def test_zero_matching_files_returns_error(self, temp_real_image_dir):
         """Directory with no matching files returns error."""
-        result = BatchImageLoader.VALIDATE_INPUTS(
+        result = self.validate(
             temp_real_image_dir, "Custom", "Continue", "Stop on error", "*.gif"
         )
         assert isinstance(result, str)
@@ -117,120 +168,115 @@ class TestValidateInputs:
 
     def test_valid_directory_returns_true(self, temp_real_image_dir):
         """Valid directory with images returns True."""
-        result = BatchImageLoader.VALIDATE_INPUTS(
-            temp_real_image_dir, "All Images"
-        )
+        result = self.validate(temp_real_image_dir, "All Images")
         assert result is True
 
 
 class TestLoadImage:
-    """Tests for load_image method."""
-
-    def test_returns_tuple_of_nine_elements(self, temp_real_image_dir):
+    """Tests for load_image method.
+
+    The output checks here all inspect the same first call, so the node runs
+    (and decodes a PNG) once for the class instead of once per test.
+    """
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def result(cls, temp_real_image_dir):
+        """Outputs of a single fresh load_image call on temp_real_image_dir."""
+        IterationState.clear_all()
+        clear_file_cache()
+        result = BatchImageLoader().load_image(temp_real_image_dir, "All Images")
+        IterationState.clear_all()
+        clear_file_cache()
+        return result
+
+    def test_returns_tuple_of_nine_elements(self, result):
         """load_image returns a tuple with exactly 9 elements."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         assert isinstance(result, tuple)
         assert len(result) == 9
 
-    def test_image_is_torch_tensor(self, temp_real_image_dir):
+    def test_image_is_torch_tensor(self, result):
         """IMAGE output is a torch.Tensor."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         image = result[0]
         assert isinstance(image, torch.Tensor)
 
-    def test_image_shape_is_batch_height_width_channels(self, temp_real_image_dir):
+    def test_image_shape_is_batch_height_width_channels(self, result):
         """IMAGE tensor has shape [1, H, W, 3]."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         image = result[0]
         assert len(image.shape) == 4
         assert image.shape[0] == 1  # Batch dimension
         assert image.shape[3] == 3  # RGB channels
 
-    def test_total_count_matches_file_count(self, temp_real_image_dir):
+    def test_total_count_matches_file_count(self, result):
         """TOTAL_COUNT matches number of matching files."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         total_count = result[6]  # TOTAL_COUNT at index 6
         # temp_real_image_dir has 3 PNG files
         assert total_count == 3
 
-    def test_load_image_returns_0_based_index(self, temp_real_image_dir):
+    def test_load_image_returns_0_based_index(self, result):
         """INDEX is 0-based (first image returns 0)."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         index = result[5]  # INDEX at index 5
         assert index == 0
 
-    def test_filename_includes_extension(self, temp_real_image_dir):
+    def test_filename_includes_extension(self, result):
         """FILENAME includes the file extension."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         filename = result[4]  # FILENAME at index 4
         assert "." in filename
         assert filename.endswith(".png")
 
-    def test_basename_excludes_extension(self, temp_real_image_dir):
+    def test_basename_excludes_extension(self, result):
         """INPUT_BASE_NAME excludes the file extension."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         basename = result[2]  # INPUT_BASE_NAME at index 2
         assert "." not in basename
         assert basename.startswith("img")
 
-    def test_source_directory_output_exists(self, temp_real_image_dir):
+    def test_source_directory_output_exists(self, result, temp_real_image_dir_normalized):
         """INPUT_DIRECTORY output is the folder name only."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         input_directory_name = result[1]  # INPUT_DIRECTORY at index 1
         assert isinstance(input_directory_name, str)
         # Should be just the folder name, not the full path
-        import os
-        expected_name = os.path.basename(os.path.normpath(temp_real_image_dir))
+        expected_name = os.path.basename(temp_real_image_dir_normalized)
         assert input_directory_name == expected_name
 
-    def test_original_format_output_exists(self, temp_real_image_dir):
+    def test_original_format_output_exists(self, result):
         """INPUT_FILE_TYPE output is a string with the file extension."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         original_format = result[3]  # INPUT_FILE_TYPE at index 3
         assert isinstance(original_format, str)
         assert original_format == "png"  # Test images are PNG
 
-    def test_status_output_exists(self, temp_real_image_dir):
+    def test_status_output_exists(self, result):
         """STATUS output is a string."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         status = result[7]  # STATUS at index 7
         assert isinstance(status, str)
         assert status in ["processing", "completed"]
 
-    def test_batch_complete_output_exists(self, temp_real_image_dir):
+    def test_batch_complete_output_exists(self, result):
         """BATCH_COMPLETE output is a boolean."""
-        loader = BatchImageLoader()
-        result = loader.load_image(temp_real_image_dir, "All Images")
         batch_complete = result[8]  # BATCH_COMPLETE at index 8
         assert isinstance(batch_complete, bool)
 
 
+@pytest.mark.usefixtures("fast_decode")
 class TestNaturalSortOrder:
     """Tests for natural sort ordering."""
 
-    def test_natural_sort_order(self, temp_real_image_dir):
+    def test_natural_sort_order(self, temp_real_image_dir, loader):
         """Files are loaded in natural sort order (img1, img2, img10)."""
-        loader = BatchImageLoader()
-
         # First load - should be img1.png at index 0
         result = loader.load_image(temp_real_image_dir, "All Images")
         assert result[4] == "img1.png"  # FILENAME at index 4
         assert result[5] == 0  # INDEX at index 5
 
-    def test_index_advances_with_state(self, temp_real_image_dir):
-        """Index advances via internal state, not input parameter."""
-        loader = BatchImageLoader()
+    def test_equal_natural_keys_break_ties_by_name(self, temp_image_dir):
+        """Names with equal natural keys (photo001/photo01/photo1) sort deterministically."""
+        files, total_count = BatchImageLoader._ensure_file_list(
+            os.path.normpath(temp_image_dir), "*.jpg"
+        )
+        assert total_count == 3
+        assert [entry[0] for entry in files] == ["photo001.jpg", "photo01.jpg", "photo1.jpg"]
 
+    def test_index_advances_with_state(self, temp_real_image_dir, loader):
+        """Index advances via internal state, not input parameter."""
         # First load - should be img1.png at index 0
         result = loader.load_image(temp_real_image_dir, "All Images")
         assert result[4] == "img1.png"  # FILENAME at index 4
@@ -242,19 +288,18 @@ class TestNaturalSortOrder:
         assert result[5] == 1  # INDEX at index 5
 
 
+@pytest.mark.usefixtures("fast_decode")
 class TestFilterPresets:
     """Tests for filter preset functionality."""
 
-    def test_png_only_filters_correctly(self, temp_mixed_image_dir):
+    def test_png_only_filters_correctly(self, temp_mixed_image_dir, loader):
         """PNG Only preset only returns PNG files."""
-        loader = BatchImageLoader()
         result = loader.load_image(temp_mixed_image_dir, "PNG Only")
         assert result[6] == 1  # TOTAL_COUNT at index 6 - Only 1 PNG file
         assert result[4].endswith(".png")  # FILENAME at index 4
 
-    def test_custom_pattern_works(self, temp_mixed_image_dir):
+    def test_custom_pattern_works(self, temp_mixed_image_dir, loader):
         """Custom pattern filters files correctly."""
-        loader = BatchImageLoader()
         result = loader.load_image(
             temp_mixed_image_dir, "Custom", custom_pattern="*.jpg"
         )
@@ -262,104 +307,378 @@ class TestFilterPresets:
         assert result[4].endswith(".jpg")  # FILENAME at index 4
 
 
-class TestIsChanged:
-    """Tests for IS_CHANGED class method."""
+class TestFileListCache:
+    """Tests for the cached sorted file listing."""
 
-    def test_returns_string(self):
-        """IS_CHANGED returns a string."""
-        result = BatchImageLoader.IS_CHANGED("/some/path", "All Images")
-        assert isinstance(result, str)
+    def test_directory_scanned_once_per_batch(self, temp_real_image_dir, loader):
+        """Consecutive queue ticks reuse the cached listing instead of rescanning."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-    def test_different_inputs_different_result(self):
-        """Different inputs produce different IS_CHANGED results."""
-        result1 = BatchImageLoader.IS_CHANGED("/path1", "All Images")
-        result2 = BatchImageLoader.IS_CHANGED("/path2", "All Images")
-        assert result1 != result2
+        with patch.object(
+            batch_loader_module,
+            "filter_files_by_patterns",
+            wraps=batch_loader_module.filter_files_by_patterns,
+        ) as mock_filter:
+            loader.load_image(temp_real_image_dir, "All Images")
+            loader.load_image(temp_real_image_dir, "All Images")
+            loader.load_image(temp_real_image_dir, "All Images")
 
-    def test_empty_directory_returns_empty_string(self):
-        """Empty directory returns empty string."""
-        result = BatchImageLoader.IS_CHANGED("", "All Images")
-        assert result == ""
+        assert mock_filter.call_count == 1
 
+    def test_validate_inputs_shares_cache(self, temp_real_image_dir, loader):
+        """VALIDATE_INPUTS scan is reused by the following load_image call."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-class TestIterationModes:
-    """Tests for iteration mode behavior."""
+        with patch.object(
+            batch_loader_module,
+            "filter_files_by_patterns",
+            wraps=batch_loader_module.filter_files_by_patterns,
+        ) as mock_filter:
+            assert BatchImageLoader.VALIDATE_INPUTS(temp_real_image_dir, "All Images") is True
+            loader.load_image(temp_real_image_dir, "All Images")
 
-    def test_iteration_mode_reset_starts_from_zero(self, temp_real_image_dir):
-        """Reset mode always starts from index 0."""
-        loader = BatchImageLoader()
+        assert mock_filter.call_count == 1
 
-        # First load with Continue mode - starts at 0
-        result1 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result1[5] == 0  # INDEX at index 5
-        assert result1[4] == "img1.png"  # FILENAME at index 4
+    def test_validating_queued_jobs_scans_once(self, temp_real_image_dir):
+        """Validating many queued jobs for an unchanged directory scans it once."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-        # Second load advances to index 1 (after first load advanced state)
-        # Now use Reset mode - should start from 0 again
-        result2 = loader.load_image(temp_real_image_dir, "All Images", "Reset")
-        assert result2[5] == 0  # INDEX at index 5
-        assert result2[4] == "img1.png"  # FILENAME at index 4
+        with patch.object(
+            batch_loader_module,
+            "filter_files_by_patterns",
+            wraps=batch_loader_module.filter_files_by_patterns,
+        ) as mock_filter:
+            for _ in range(50):
+                assert BatchImageLoader.VALIDATE_INPUTS(temp_real_image_dir, "All Images") is True
 
-    def test_iteration_mode_continue_preserves_position(self, temp_real_image_dir):
-        """Continue mode preserves position across executions."""
-        loader = BatchImageLoader()
+        assert mock_filter.call_count == 1
 
-        # First execution - index 0
-        result1 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result1[5] == 0  # INDEX at index 5
+    def test_validate_inputs_cache_ignores_trailing_separator(self, temp_real_image_dir, loader):
+        """Path spelling differences still share one scan between validate and load."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-        # Second execution - index 1 (advanced by first)
-        result2 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result2[5] == 1  # INDEX at index 5
+        with patch.object(
+            batch_loader_module,
+            "filter_files_by_patterns",
+            wraps=batch_loader_module.filter_files_by_patterns,
+        ) as mock_filter:
+            BatchImageLoader.VALIDATE_INPUTS(temp_real_image_dir + os.sep, "All Images")
+            loader.load_image(temp_real_image_dir, "All Images")
 
-        # Third execution - index 2 (advanced by second)
-        result3 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result3[5] == 2  # INDEX at index 5
+        assert mock_filter.call_count == 1
 
+    def test_sort_key_computed_once_per_file(self, temp_real_image_dir, loader):
+        """A rescan computes each file's natural sort key exactly once."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-class TestBatchCompletion:
-    """Tests for batch completion detection."""
+        with patch.object(
+            batch_loader_module,
+            "natural_sort_key",
+            wraps=batch_loader_module.natural_sort_key,
+        ) as mock_key:
+            loader.load_image(temp_real_image_dir, "All Images")
+            loader.load_image(temp_real_image_dir, "All Images")
+
+        # 3 files, sorted once; the second tick reuses the cached order
+        assert mock_key.call_count == 3
+
+    def test_cached_listing_is_immutable(self, temp_real_image_dir_normalized):
+        """The shared listing is a tuple, so callers can't mutate the cache."""
+        files, _ = BatchImageLoader._ensure_file_list(temp_real_image_dir_normalized, "*.png")
+        again, _ = BatchImageLoader._ensure_file_list(temp_real_image_dir_normalized, "*.png")
+        assert isinstance(files, tuple)
+        assert again is files
+
+    def test_cache_bounded_to_recent_listings(self, temp_real_image_dir_normalized):
+        """Only the most recently used (directory, pattern) listings are kept."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-    def test_batch_complete_true_on_last_image(self, temp_real_image_dir):
-        """BATCH_COMPLETE is True only when processing last image."""
-        loader = BatchImageLoader()
+        size = batch_loader_module._SORTED_CACHE_SIZE
+        patterns = [f"*{i}.png" for i in range(size + 2)]
+        for pattern in patterns:
+            BatchImageLoader._ensure_file_list(temp_real_image_dir_normalized, pattern)
+        # Touching the oldest surviving entry keeps it from being evicted next
+        BatchImageLoader._ensure_file_list(temp_real_image_dir_normalized, patterns[2])
+        BatchImageLoader._ensure_file_list(temp_real_image_dir_normalized, "*.webp")
+
+        cached = [pattern for _, pattern in batch_loader_module._SORTED_CACHE]
+        assert len(cached) == size
+        assert patterns[0] not in cached
+        assert patterns[3] not in cached
+        assert patterns[2] in cached
+
+    def test_new_file_triggers_rescan(self, loader):
+        """Adding a file to the directory invalidates the cached listing."""
+        # Own directory: the shared image fixtures are read-only
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ["img1.png", "img2.png", "img10.png"]:
+                write_valid_png(os.path.join(tmpdir, name))
 
-        # First image (index 0) - not complete
-        result1 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result1[8] is False  # batch_complete
+            result1 = loader.load_image(tmpdir, "All Images")
+            assert result1[6] == 3  # TOTAL_COUNT at index 6
 
-        # Second image (index 1) - not complete
-        result2 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result2[8] is False  # batch_complete
+            write_valid_png(os.path.join(tmpdir, "img20.png"))
 
-        # Third/last image (index 2) - complete
-        result3 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result3[8] is True  # batch_complete
+            result2 = loader.load_image(tmpdir, "All Images")
+            assert result2[6] == 4  # TOTAL_COUNT at index 6
 
-    def test_status_output_processing_vs_completed(self, temp_real_image_dir):
-        """STATUS is 'processing' for non-last images, 'completed' for last."""
-        loader = BatchImageLoader()
+    def test_reset_forces_rescan(self, temp_real_image_dir, loader):
+        """Reset mode bypasses the cached listing."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
-        # First image - processing
-        result1 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result1[7] == "processing"
+        with patch.object(
+            batch_loader_module,
+            "filter_files_by_patterns",
+            wraps=batch_loader_module.filter_files_by_patterns,
+        ) as mock_filter:
+            loader.load_image(temp_real_image_dir, "All Images")
+            loader.load_image(temp_real_image_dir, "All Images", "Reset")
 
-        # Second image - processing
-        result2 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result2[7] == "processing"
+        assert mock_filter.call_count == 2
+
+
+class TestPrefetch:
+    """Tests for background prefetch of the next image."""
+
+    def test_next_image_prefetched(self, temp_real_image_dir, temp_real_image_dir_normalized, loader):
+        """Loading an image schedules a background decode of the next one."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images")
+
+        next_path = os.path.join(temp_real_image_dir_normalized, "img2.png")
+        assert next_path in batch_loader_module._PREFETCH_CACHE
+
+    def test_prefetched_image_consumed(self, temp_real_image_dir, temp_real_image_dir_normalized, loader):
+        """The next execution uses the prefetched tensor instead of decoding again."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images")
+
+        next_path = os.path.join(temp_real_image_dir_normalized, "img2.png")
+        prefetched = batch_loader_module._PREFETCH_CACHE[next_path][1].result()
+
+        result = loader.load_image(temp_real_image_dir, "All Images")
+        assert result[4] == "img2.png"  # FILENAME at index 4
+        assert result[0] is prefetched
+        assert next_path not in batch_loader_module._PREFETCH_CACHE
+
+    def test_modified_file_not_served_from_prefetch(self, loader):
+        """A file rewritten after it was prefetched is decoded again."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        # Own directory: the file is modified mid-batch
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ["a1.png", "a2.png", "a3.png"]:
+                write_valid_png(os.path.join(tmpdir, name))
+
+            loader.load_image(tmpdir, "All Images")
+            a2_path = os.path.join(os.path.normpath(tmpdir), "a2.png")
+            batch_loader_module._PREFETCH_CACHE[a2_path][1].result()
+
+            Image.new("RGB", (2, 2), color="white").save(a2_path)
+
+            result = loader.load_image(tmpdir, "All Images")
+            assert result[4] == "a2.png"  # FILENAME at index 4
+            assert result[0].shape == (1, 2, 2, 3)
+            assert torch.all(result[0] == 1.0)
+
+    def test_rescan_drops_prefetched_images(self, temp_real_image_dir, temp_real_image_dir_normalized, loader):
+        """Reset rescans the directory and discards decodes from the old listing."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images")
+        next_path = os.path.join(temp_real_image_dir_normalized, "img2.png")
+        stale = batch_loader_module._PREFETCH_CACHE[next_path][1]
+
+        loader.load_image(temp_real_image_dir, "All Images", "Reset")
+
+        assert batch_loader_module._PREFETCH_CACHE[next_path][1] is not stale
+
+    def test_validate_inputs_rescan_keeps_prefetch(self, temp_real_image_dir, temp_real_image_dir_normalized, loader):
+        """A queue-time rescan in VALIDATE_INPUTS leaves scheduled decodes alone."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images")
+        next_path = os.path.join(temp_real_image_dir_normalized, "img2.png")
+        scheduled = batch_loader_module._PREFETCH_CACHE[next_path][1]
+
+        # Force a rescan by changing the cached listing's mtime
+        key = next(iter(batch_loader_module._SORTED_CACHE))
+        files, mtime = batch_loader_module._SORTED_CACHE[key]
+        batch_loader_module._SORTED_CACHE[key] = (files, mtime - 1)
+        assert BatchImageLoader.VALIDATE_INPUTS(temp_real_image_dir, "All Images") is True
+
+        assert batch_loader_module._PREFETCH_CACHE[next_path][1] is scheduled
+        assert not scheduled.cancelled()
+
+    def test_prefetch_scheduled_before_current_load(self, temp_real_image_dir, temp_real_image_dir_normalized, loader):
+        """Upcoming images are already decoding while the current one loads."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        next_path = os.path.join(temp_real_image_dir_normalized, "img2.png")
+        real_load = batch_loader_module._load_tensor
+        pending_at_load = []
+
+        def spy_load(filepath):
+            pending_at_load.append(next_path in batch_loader_module._PREFETCH_CACHE)
+            return real_load(filepath)
 
-        # Third/last image - completed
-        result3 = loader.load_image(temp_real_image_dir, "All Images")
-        assert result3[7] == "completed"
+        with patch.object(batch_loader_module, "_load_tensor", side_effect=spy_load):
+            loader.load_image(temp_real_image_dir, "All Images")
 
+        assert pending_at_load == [True]
 
+    def test_prefetch_count_limits_ring(self, temp_real_image_dir, loader):
+        """prefetch_count bounds how many upcoming images are decoded."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images", prefetch_count=1)
+        assert len(batch_loader_module._PREFETCH_CACHE) == 1
+
+        batch_loader_module.clear_file_cache()
+        IterationState.clear_all()
+        loader.load_image(temp_real_image_dir, "All Images", prefetch_count=4)
+        # Only two images remain after the first, so the ring stops at the batch end
+        assert len(batch_loader_module._PREFETCH_CACHE) == 2
+
+    def test_prefetch_window_follows_prefetch_count(self, loader):
+        """Lowering prefetch_count drops prefetched images outside the new window."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(1, 7):
+                write_valid_png(os.path.join(tmpdir, f"f{i}.png"))
+            directory = os.path.normpath(tmpdir)
+
+            loader.load_image(tmpdir, "All Images", prefetch_count=4)
+            assert len(batch_loader_module._PREFETCH_CACHE) == 4
+
+            loader.load_image(tmpdir, "All Images", prefetch_count=1)
+            # f2 was consumed by this load; only the next image stays queued
+            assert list(batch_loader_module._PREFETCH_CACHE) == [
+                os.path.join(directory, "f3.png")
+            ]
+
+    def test_prefetch_disabled_with_zero(self, temp_real_image_dir, loader):
+        """prefetch_count=0 disables background decoding."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images", prefetch_count=0)
+
+        assert batch_loader_module._PREFETCH_CACHE == {}
+
+    def test_no_prefetch_after_last_image(self, temp_real_image_dir, loader):
+        """Completing the batch does not prefetch the wrapped-around first image."""
+        import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
+
+        loader.load_image(temp_real_image_dir, "All Images", start_index=2)
+
+        assert batch_loader_module._PREFETCH_CACHE == {}
+
+
+class TestIsChanged:
+    """Tests for IS_CHANGED class method."""
+
+    def test_returns_hashable_tuple(self):
+        """IS_CHANGED returns a hashable tuple (ComfyUI compares and hashes it)."""
+        result = BatchImageLoader.IS_CHANGED("/some/path", "All Images")
+        assert isinstance(result, tuple)
+        hash(result)
+
+    def test_index_change_changes_result(self):
+        """Advancing the iteration state changes the IS_CHANGED result."""
+        result1 = BatchImageLoader.IS_CHANGED("/some/path", "All Images")
+        IterationState.advance("/some/path")
+        result2 = BatchImageLoader.IS_CHANGED("/some/path", "All Images")
+        assert result1 != result2
+
+    def test_different_inputs_different_result(self):
+        """Different inputs produce different IS_CHANGED results."""
+        result1 = BatchImageLoader.IS_CHANGED("/path1", "All Images")
+        result2 = BatchImageLoader.IS_CHANGED("/path2", "All Images")
+        assert result1 != result2
+
+    def test_nonce_changes_result(self):
+        """A new queue_nonce produces a new IS_CHANGED result."""
+        result1 = BatchImageLoader.IS_CHANGED("/path1", "All Images", queue_nonce=1)
+        result2 = BatchImageLoader.IS_CHANGED("/path1", "All Images", queue_nonce=2)
+        assert result1 != result2
+
+    def test_nonce_skips_state_lookup(self):
+        """With a queue_nonce, IS_CHANGED does not touch IterationState."""
+        with patch.object(IterationState, "get_state") as mock_get_state:
+            BatchImageLoader.IS_CHANGED("/path1", "All Images", queue_nonce=123)
+        mock_get_state.assert_not_called()
+
+    def test_empty_directory_returns_empty_string(self):
+        """Empty directory returns empty string."""
+        result = BatchImageLoader.IS_CHANGED("", "All Images")
+        assert result == ""
+
+
+@pytest.mark.usefixtures("fast_decode")
+class TestIterationModes:
+    """Tests for iteration state across executions (modes, interruption, wraparound)."""
+
+    @pytest.mark.parametrize(
+        "sequence",
+        [
+            pytest.param(
+                [("Continue", 0, "img1.png"), ("Continue", 1, "img2.png"), ("Continue", 2, "img10.png")],
+                id="continue_preserves_position",
+            ),
+            pytest.param(
+                [("Continue", 0, "img1.png"), ("Reset", 0, "img1.png")],
+                id="reset_starts_from_zero",
+            ),
+            pytest.param(
+                [("Continue", 0, "img1.png"), ("Continue", 1, "img2.png"), ("Reset", 0, "img1.png")],
+                id="reset_clears_advanced_index",
+            ),
+            pytest.param(
+                [
+                    ("Continue", 0, "img1.png"),
+                    ("Continue", 1, "img2.png"),
+                    ("Continue", 2, "img10.png"),
+                    ("Continue", 0, "img1.png"),
+                ],
+                id="index_wraps_after_completion",
+            ),
+        ],
+    )
+    def test_mode_sequence(self, sequence, temp_real_image_dir, loader):
+        """Each execution loads the expected image and persists the advanced index.
+
+        The persisted index is what a resumed queue continues from after an
+        interrupt, so it is checked after every step; completing the batch
+        resets it to 0.
+        """
+        for mode, expected_index, expected_filename in sequence:
+            result = loader.load_image(temp_real_image_dir, "All Images", mode)
+            assert result[5] == expected_index  # INDEX at index 5
+            assert result[4] == expected_filename  # FILENAME at index 4
+            state = IterationState.get_state(temp_real_image_dir)
+            assert state["index"] == (expected_index + 1) % 3
+
+
+@pytest.mark.usefixtures("fast_decode")
+class TestBatchCompletion:
+    """Tests for batch completion detection."""
+
+    def test_batch_complete_true_on_last_image(self, temp_real_image_dir, loader):
+        """BATCH_COMPLETE and STATUS flag only the last image of the batch."""
+        results = [loader.load_image(temp_real_image_dir, "All Images") for _ in range(3)]
+        assert [r[8] for r in results] == [False, False, True]  # BATCH_COMPLETE
+        assert [r[7] for r in results] == ["processing", "processing", "completed"]  # STATUS
+
+
+@pytest.mark.usefixtures("fast_decode")
 class TestStartIndex:
     """Tests for start_index input."""
 
-    def test_start_index_input(self, temp_real_image_dir):
+    def test_start_index_input(self, temp_real_image_dir, loader):
         """start_index allows starting from specific position."""
-        loader = BatchImageLoader()
-
         # Start at index 1 (second image)
         result = loader.load_image(
             temp_real_image_dir, "All Images", start_index=1
@@ -367,10 +686,8 @@ class TestStartIndex:
         assert result[5] == 1  # INDEX at index 5
         assert result[4] == "img2.png"  # FILENAME at index 4
 
-    def test_start_index_only_applies_when_state_is_zero(self, temp_real_image_dir):
+    def test_start_index_only_applies_when_state_is_zero(self, temp_real_image_dir, loader):
         """start_index only applies if current state index is 0."""
-        loader = BatchImageLoader()
-
         # First load with start_index=0 (default)
         result1 = loader.load_image(temp_real_image_dir, "All Images")
         assert result1[5] == 0  # INDEX at index 5
@@ -382,13 +699,12 @@ class TestStartIndex:
         assert result2[5] == 1  # INDEX at index 5 - Continues from state, not start_index
 
 
+@pytest.mark.usefixtures("fast_decode")
 class TestDirectoryChange:
     """Tests for directory change detection."""
 
-    def test_directory_change_resets_state(self, temp_real_image_dir, temp_mixed_image_dir):
+    def test_directory_change_resets_state(self, temp_real_image_dir, temp_mixed_image_dir, loader):
         """Switching directories resets the state."""
-        loader = BatchImageLoader()
-
         # Load from first directory, advance index
         result1 = loader.load_image(temp_real_image_dir, "All Images")
         assert result1[5] == 0  # INDEX at index 5
@@ -409,185 +725,64 @@ class TestDirectoryChange:
 class TestErrorHandling:
     """Tests for error handling modes."""
 
-    def test_error_handling_stop_on_error(self, temp_real_image_dir):
+    def test_error_handling_stop_on_error(self, corrupt_only_dir, loader):
         """Stop on error raises exception when image fails."""
-        loader = BatchImageLoader()
-
-        # Create a temp dir with a corrupt file
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a corrupt "image" file
-            corrupt_path = os.path.join(tmpdir, "corrupt.png")
-            with open(corrupt_path, "w") as f:
-                f.write("not an image")
-
-            with pytest.raises(RuntimeError) as exc_info:
-                loader.load_image(tmpdir, "All Images", error_handling="Stop on error")
+        with pytest.raises(RuntimeError) as exc_info:
+            loader.load_image(corrupt_only_dir, "All Images", error_handling="Stop on error")
 
-            assert "Failed to load image" in str(exc_info.value)
+        assert "Failed to load image" in str(exc_info.value)
 
-    def test_error_handling_skip_on_error(self, temp_real_image_dir):
+    def test_error_handling_skip_on_error(self, corrupt_and_valid_dir, loader):
         """Skip on error continues to next image when one fails."""
-        loader = BatchImageLoader()
+        # Should skip aaa_corrupt.png and return the valid file after it
+        result = loader.load_image(
+            corrupt_and_valid_dir, "All Images", error_handling="Skip on error"
+        )
+        assert result[4] == "bbb_valid.png"  # FILENAME at index 4
 
-        # Create a temp dir with a corrupt file and a valid file
+    def test_skip_on_error_handles_many_failures(self, loader):
+        """Skipping more failures than the recursion limit still succeeds."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a corrupt "image" file (sorts first alphabetically)
-            corrupt_path = os.path.join(tmpdir, "aaa_corrupt.png")
-            with open(corrupt_path, "w") as f:
-                f.write("not an image")
-
-            # Create a valid image
-            valid_path = os.path.join(tmpdir, "bbb_valid.png")
-            img = Image.new("RGB", (50, 50), color="green")
-            img.save(valid_path)
+            for i in range(sys.getrecursionlimit() + 10):
+                with open(os.path.join(tmpdir, f"bad{i}.png"), "w") as f:
+                    f.write("not an image")
+            write_valid_png(os.path.join(tmpdir, "zzz_valid.png"))
 
-            # Should skip corrupt file and return valid one
             result = loader.load_image(
-                tmpdir, "All Images", error_handling="Skip on error"
+                tmpdir, "All Images", error_handling="Skip on error", prefetch_count=0
             )
-            assert result[4] == "bbb_valid.png"  # FILENAME at index 4
+            assert result[4] == "zzz_valid.png"  # FILENAME at index 4
 
-    def test_error_handling_all_files_fail(self):
+    def test_error_handling_all_files_fail(self, corrupt_only_dir, loader):
         """Raises error when all files fail to load."""
-        loader = BatchImageLoader()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create only corrupt files
-            for name in ["a.png", "b.png"]:
-                path = os.path.join(tmpdir, name)
-                with open(path, "w") as f:
-                    f.write("not an image")
-
-            with pytest.raises(RuntimeError) as exc_info:
-                loader.load_image(
-                    tmpdir, "All Images", error_handling="Skip on error"
-                )
-
-            assert "all files skipped or failed" in str(exc_info.value).lower()
-
-
-class TestInterruption:
-    """Tests for interruption behavior."""
-
-    def test_interruption_continue_mode_preserves_index(self, temp_real_image_dir):
-        """In Continue mode, state index is preserved for resume after interrupt."""
-        loader = BatchImageLoader()
-
-        # Simulate: load first image, then "interrupt" by not completing
-        # In reality, ComfyUI interrupt just stops execution, we don't advance
-        # This test verifies state persistence
-
-        # First execution
-        result1 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result1[5] == 0  # INDEX at index 5
-
-        # Simulate getting state before next execution (as would happen on resume)
-        state = IterationState.get_state(temp_real_image_dir)
-        # State should have advanced to 1 after first successful load
-        assert state["index"] == 1
-
-        # Second execution continues from 1
-        result2 = loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        assert result2[5] == 1  # INDEX at index 5
-
-    def test_interruption_reset_mode_clears_index(self, temp_real_image_dir):
-        """Reset mode always clears index regardless of prior state."""
-        loader = BatchImageLoader()
-
-        # Advance the state
-        loader.load_image(temp_real_image_dir, "All Images", "Continue")
-        loader.load_image(temp_real_image_dir, "All Images", "Continue")
-
-        # State should be at 2 now
-        state = IterationState.get_state(temp_real_image_dir)
-        assert state["index"] == 2
+        with pytest.raises(RuntimeError) as exc_info:
+            loader.load_image(
+                corrupt_only_dir, "All Images", error_handling="Skip on error"
+            )
 
-        # Reset mode should start from 0
-        result = loader.load_image(temp_real_image_dir, "All Images", "Reset")
-        assert result[5] == 0  # INDEX at index 5
+        assert "all files skipped or failed" in str(exc_info.value).lower()
 
 
+@pytest.mark.usefixtures("fast_decode")
 class TestQueueControl:
     """Tests for queue control function calls."""
 
-    @patch("comfyui_batch_image_processing.nodes.batch_loader.trigger_next_queue")
-    def test_trigger_next_queue_called_when_not_complete(
-        self, mock_trigger, temp_real_image_dir
-    ):
-        """trigger_next_queue is called when not on last image."""
-        loader = BatchImageLoader()
-
-        # Load first image (not last)
-        loader.load_image(temp_real_image_dir, "All Images")
-
-        mock_trigger.assert_called_once()
-
-    @patch("comfyui_batch_image_processing.nodes.batch_loader.trigger_next_queue")
-    def test_trigger_next_queue_not_called_on_last_image(
-        self, mock_trigger, temp_real_image_dir
-    ):
-        """trigger_next_queue is NOT called on last image."""
-        loader = BatchImageLoader()
-
-        # Advance to last image
-        loader.load_image(temp_real_image_dir, "All Images")  # 0
-        mock_trigger.reset_mock()
-        loader.load_image(temp_real_image_dir, "All Images")  # 1
-        mock_trigger.reset_mock()
-
-        # Last image
-        loader.load_image(temp_real_image_dir, "All Images")  # 2 (last)
-
-        mock_trigger.assert_not_called()
-
     @patch("comfyui_batch_image_processing.nodes.batch_loader.stop_auto_queue")
-    def test_stop_auto_queue_called_on_batch_complete(
-        self, mock_stop, temp_real_image_dir
-    ):
-        """stop_auto_queue is called when batch completes."""
-        loader = BatchImageLoader()
-
-        # Load all images until last
-        loader.load_image(temp_real_image_dir, "All Images")  # 0
-        loader.load_image(temp_real_image_dir, "All Images")  # 1
-        mock_stop.assert_not_called()
-
-        # Load last image
-        loader.load_image(temp_real_image_dir, "All Images")  # 2 (last)
-
-        mock_stop.assert_called_once()
-
-    @patch("comfyui_batch_image_processing.nodes.batch_loader.stop_auto_queue")
-    def test_stop_auto_queue_not_called_before_complete(
-        self, mock_stop, temp_real_image_dir
+    @patch("comfyui_batch_image_processing.nodes.batch_loader.trigger_next_queue")
+    def test_queue_calls_across_batch(
+        self, mock_trigger, mock_stop, temp_real_image_dir, loader
     ):
-        """stop_auto_queue is NOT called before batch completes."""
-        loader = BatchImageLoader()
-
-        # Load first two images (not last)
-        loader.load_image(temp_real_image_dir, "All Images")
-        loader.load_image(temp_real_image_dir, "All Images")
-
-        mock_stop.assert_not_called()
-
+        """trigger_next_queue fires before the last image; stop_auto_queue only on it."""
+        trigger_calls = []
+        stop_calls = []
+        for _ in range(3):
+            loader.load_image(temp_real_image_dir, "All Images")
+            trigger_calls.append(mock_trigger.call_count)
+            stop_calls.append(mock_stop.call_count)
 
-class TestIndexWraparound:
-    """Tests for index wraparound after batch completion."""
-
-    def test_index_wraps_after_completion(self, temp_real_image_dir):
-        """Index wraps back to 0 after batch completes."""
-        loader = BatchImageLoader()
-
-        # Process all 3 images
-        loader.load_image(temp_real_image_dir, "All Images")  # 0
-        loader.load_image(temp_real_image_dir, "All Images")  # 1
-        result = loader.load_image(temp_real_image_dir, "All Images")  # 2 (last)
-        assert result[8] is True  # BATCH_COMPLETE at index 8
-
-        # Next load should wrap to 0
-        result = loader.load_image(temp_real_image_dir, "All Images")
-        assert result[5] == 0  # INDEX at index 5
-        assert result[4] == "img1.png"  # FILENAME at index 4
+        # Cumulative call counts after images 0, 1 and 2 (last)
+        assert trigger_calls == [1, 2, 2]
+        assert stop_calls == [0, 0, 1]
 
 
 class TestBroadcastBehavior:
@@ -600,7 +795,7 @@ class TestBroadcastBehavior:
         assert "unique_id" in result["hidden"]
         assert result["hidden"]["unique_id"] == "UNIQUE_ID"
 
-    def test_broadcasts_executed_event_when_server_available(self, temp_real_image_dir):
+    def test_broadcasts_executed_event_when_server_available(self, temp_real_image_dir, loader):
         """Broadcasts 'executed' event with INDEX and TOTAL_COUNT when server is available."""
         import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
@@ -611,7 +806,6 @@ class TestBroadcastBehavior:
 
         with mock.patch.object(batch_loader_module, "HAS_SERVER", True):
             with mock.patch.object(batch_loader_module, "PromptServer", mock_prompt_server):
-                loader = BatchImageLoader()
                 result = loader.load_image(
                     temp_real_image_dir, "All Images", unique_id="789"
                 )
@@ -628,7 +822,7 @@ class TestBroadcastBehavior:
         assert "STATUS" in output
         assert call_args[1]["sid"] is None  # Broadcast to ALL clients
 
-    def test_broadcast_includes_index_and_total(self, temp_real_image_dir):
+    def test_broadcast_includes_index_and_total(self, temp_real_image_dir, loader):
         """Broadcast output dict contains correct INDEX and TOTAL_COUNT values."""
         import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
@@ -638,7 +832,6 @@ class TestBroadcastBehavior:
 
         with mock.patch.object(batch_loader_module, "HAS_SERVER", True):
             with mock.patch.object(batch_loader_module, "PromptServer", mock_prompt_server):
-                loader = BatchImageLoader()
                 result = loader.load_image(
                     temp_real_image_dir, "All Images", unique_id="test123"
                 )
@@ -651,7 +844,7 @@ class TestBroadcastBehavior:
         assert output["FILENAME"] == ["img1.png"]  # First file in natural sort order
         assert output["STATUS"] == ["processing"]  # Not last image
 
-    def test_no_broadcast_without_unique_id(self, temp_real_image_dir):
+    def test_no_broadcast_without_unique_id(self, temp_real_image_dir, loader):
         """No broadcast when unique_id is None."""
         import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
@@ -661,7 +854,6 @@ class TestBroadcastBehavior:
 
         with mock.patch.object(batch_loader_module, "HAS_SERVER", True):
             with mock.patch.object(batch_loader_module, "PromptServer", mock_prompt_server):
-                loader = BatchImageLoader()
                 result = loader.load_image(
                     temp_real_image_dir, "All Images", unique_id=None
                 )
@@ -669,14 +861,13 @@ class TestBroadcastBehavior:
         # send_sync should NOT have been called
         mock_server_instance.send_sync.assert_not_called()
 
-    def test_no_crash_without_server(self, temp_real_image_dir):
+    def test_no_crash_without_server(self, temp_real_image_dir, loader):
         """No crash when HAS_SERVER is False (default test environment)."""
         import comfyui_batch_image_processing.nodes.batch_loader as batch_loader_module
 
         # Ensure HAS_SERVER is False (simulating test environment)
         with mock.patch.object(batch_loader_module, "HAS_SERVER", False):
             with mock.patch.object(batch_loader_module, "PromptServer", None):
-                loader = BatchImageLoader()
                 # Should not raise an exception
                 result = loader.load_image(
                     temp_real_image_dir, "All Images", unique_id="abc"
@@ -2,6 +2,7 @@
 
 import os
 import tempfile
+import threading
 from unittest import mock
 
 import pytest
@@ -10,9 +11,66 @@ from PIL import Image
 
 # Import BatchImageSaver through the root package (as ComfyUI would)
 from comfyui_batch_image_processing import NODE_CLASS_MAPPINGS
+from comfyui_batch_image_processing.nodes import batch_saver as batch_saver_module
+from comfyui_batch_image_processing.nodes.batch_saver import flush_pending_saves
 
 BatchImageSaver = NODE_CLASS_MAPPINGS["BatchImageSaver"]
 
+# Contents of pre-existing files used to trigger Skip/Rename. Overwrite
+# handling only checks that the path exists, so no real image is needed.
+EXISTING_FILE_BYTES = b"\x89PNG\r\n\x1a\n"
+
+
+def _write_existing(path: str) -> None:
+    """Create a collision file at path."""
+    with open(path, "wb") as f:
+        f.write(EXISTING_FILE_BYTES)
+
+
+def _format_of(path: str) -> str | None:
+    """Identify a saved file's format from its magic bytes.
+
+    Returns the Pillow format name ("PNG", "JPEG", "WEBP"), or None.
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+# Shared read-only inputs: the saver passes tensors through untouched, and a
+# node built without folder_paths holds no per-test state. Tests that patch
+# folder_paths still construct their own saver, since __init__ reads it.
+@pytest.fixture(scope="module")
+def saver():
+    """A BatchImageSaver node instance."""
+    return BatchImageSaver()
+
+
+@pytest.fixture(scope="module")
+def ones_8():
+    """8x8 white image tensor."""
+    return torch.ones(1, 8, 8, 3, dtype=torch.float32)
+
+
+@pytest.fixture(scope="class")
+def class_output_dir(tmp_path_factory):
+    """Output directory shared by a test class whose tests write distinct files."""
+    return str(tmp_path_factory.mktemp("saver_class"))
+
+
+@pytest.fixture
+def mock_folder_paths(temp_output_dir):
+    """Patch ComfyUI's folder_paths so its output directory is temp_output_dir."""
+    with mock.patch.object(batch_saver_module, "folder_paths", create=True) as mock_paths:
+        mock_paths.get_output_directory.return_value = temp_output_dir
+        yield mock_paths
+
 
 class TestInputTypes:
     """Tests for INPUT_TYPES class method."""
@@ -67,6 +125,19 @@ class TestInputTypes:
         assert "filename_prefix" in optional
         assert "filename_suffix" in optional
 
+    def test_png_compress_level_is_optional_int(self):
+        """png_compress_level is an optional INT in zlib's 0-9 range."""
+        level = BatchImageSaver.INPUT_TYPES()["optional"]["png_compress_level"]
+        assert level[0] == "INT"
+        assert level[1]["min"] == 0
+        assert level[1]["max"] == 9
+
+    def test_optimize_is_optional_boolean_off_by_default(self):
+        """optimize is an optional BOOLEAN that defaults to off."""
+        optimize = BatchImageSaver.INPUT_TYPES()["optional"]["optimize"]
+        assert optimize[0] == "BOOLEAN"
+        assert optimize[1]["default"] is False
+
 
 class TestClassAttributes:
     """Tests for class attributes."""
@@ -99,13 +170,10 @@ class TestReturnNames:
 class TestSaveImageReturns:
     """Tests for save_image return values."""
 
-    def test_returns_result_tuple(self, temp_output_dir):
+    def test_returns_result_tuple(self, temp_output_dir, ones_8, saver):
         """save_image returns result tuple with image, filename, path."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
@@ -122,7 +190,7 @@ class TestSaveImageReturns:
         output_image, saved_filename, saved_path = result["result"]
 
         # Image should be the SAME tensor reference (passthrough, not a copy)
-        assert output_image is tensor
+        assert output_image is ones_8
 
         # Filename should be just the filename (no path)
         assert saved_filename == "test_returns.png"
@@ -130,17 +198,14 @@ class TestSaveImageReturns:
         # Path should be full absolute path
         assert saved_path == os.path.join(temp_output_dir, "test_returns.png")
 
-    def test_skip_mode_returns_empty_strings(self, temp_output_dir):
+    def test_skip_mode_returns_empty_strings(self, temp_output_dir, ones_8, saver):
         """Skip mode returns empty strings for filename/path but still passes image."""
         # Create existing file to trigger skip
         filepath = os.path.join(temp_output_dir, "existing.png")
-        Image.new("RGB", (50, 50), color="red").save(filepath)
-
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
+        _write_existing(filepath)
 
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Skip",
@@ -153,23 +218,20 @@ class TestSaveImageReturns:
         output_image, saved_filename, saved_path = result["result"]
 
         # Image STILL passes through even when skipped (for downstream preview)
-        assert output_image is tensor
+        assert output_image is ones_8
 
         # Filename and path are empty strings (not None) when skipped
         assert saved_filename == ""
         assert saved_path == ""
 
-    def test_rename_mode_returns_renamed_path(self, temp_output_dir):
+    def test_rename_mode_returns_renamed_path(self, temp_output_dir, ones_8, saver):
         """Rename mode returns the actual renamed filename and path."""
         # Create existing file to trigger rename
         filepath = os.path.join(temp_output_dir, "photo.png")
-        Image.new("RGB", (50, 50), color="red").save(filepath)
-
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
+        _write_existing(filepath)
 
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Rename",
@@ -180,219 +242,146 @@ class TestSaveImageReturns:
         output_image, saved_filename, saved_path = result["result"]
 
         # Image passes through
-        assert output_image is tensor
+        assert output_image is ones_8
 
         # Should return the RENAMED filename (photo_1.png)
         assert saved_filename == "photo_1.png"
         assert saved_path == os.path.join(temp_output_dir, "photo_1.png")
 
 
-class TestSaveImagePng:
-    """Tests for save_image with PNG format."""
+class TestSaveImageFormats:
+    """Tests for save_image with each supported format."""
 
-    def test_save_png_basic(self, temp_output_dir):
-        """Save image as PNG creates valid file."""
-        # Create a test tensor
-        tensor = torch.zeros(1, 100, 100, 3, dtype=torch.float32)
-        tensor[:, :, :, 0] = 1.0  # Red
-
-        saver = BatchImageSaver()
+    @pytest.mark.parametrize(
+        "file_type,quality,expected_format",
+        [("png", 100, "PNG"), ("jpg", 85, "JPEG"), ("webp", 90, "WEBP")],
+    )
+    def test_save_format_basic(
+        self, class_output_dir, ones_8, saver, file_type, quality, expected_format
+    ):
+        """Saving in each format creates a valid file of that format."""
         result = saver.save_image(
-            image=tensor,
-            output_file_type="png",
-            quality=100,
+            image=ones_8,
+            output_file_type=file_type,
+            quality=quality,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="test_image",
         )
 
-        # Check file was created
-        filepath = os.path.join(temp_output_dir, "test_image.png")
-        assert os.path.exists(filepath)
-
-        # Check it's a valid PNG
-        img = Image.open(filepath)
-        assert img.format == "PNG"
-        img.close()
+        # Check file was created, in the requested format
+        filename = f"test_image.{file_type}"
+        filepath = os.path.join(class_output_dir, filename)
+        assert _format_of(filepath) == expected_format
 
         # Check return value
         assert "ui" in result
         assert "images" in result["ui"]
         assert len(result["ui"]["images"]) == 1
-        assert result["ui"]["images"][0]["filename"] == "test_image.png"
-
-
-class TestSaveImageJpg:
-    """Tests for save_image with JPG format."""
-
-    def test_save_jpg_basic(self, temp_output_dir):
-        """Save image as JPG creates valid file."""
-        tensor = torch.zeros(1, 100, 100, 3, dtype=torch.float32)
-        tensor[:, :, :, 1] = 1.0  # Green
-
-        saver = BatchImageSaver()
-        result = saver.save_image(
-            image=tensor,
-            output_file_type="jpg",
-            quality=85,
-            overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
-            output_base_name="test_jpg",
-        )
-
-        filepath = os.path.join(temp_output_dir, "test_jpg.jpg")
-        assert os.path.exists(filepath)
-
-        img = Image.open(filepath)
-        assert img.format == "JPEG"
-        img.close()
-
-
-class TestSaveImageWebp:
-    """Tests for save_image with WebP format."""
-
-    def test_save_webp_basic(self, temp_output_dir):
-        """Save image as WebP creates valid file."""
-        tensor = torch.zeros(1, 100, 100, 3, dtype=torch.float32)
-        tensor[:, :, :, 2] = 1.0  # Blue
-
-        saver = BatchImageSaver()
-        result = saver.save_image(
-            image=tensor,
-            output_file_type="webp",
-            quality=90,
-            overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
-            output_base_name="test_webp",
-        )
-
-        filepath = os.path.join(temp_output_dir, "test_webp.webp")
-        assert os.path.exists(filepath)
-
-        img = Image.open(filepath)
-        assert img.format == "WEBP"
-        img.close()
+        assert result["ui"]["images"][0]["filename"] == filename
 
 
 class TestJpegExtensionPreserved:
     """Tests for preserving .jpeg extension."""
 
-    def test_jpeg_extension_preserved(self, temp_output_dir):
+    def test_jpeg_extension_preserved(self, class_output_dir, saver):
         """Jpeg file type creates .jpeg file (not .jpg)."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32) * 0.5
+        tensor = torch.full((1, 8, 8, 3), 0.5, dtype=torch.float32)
 
-        saver = BatchImageSaver()
         result = saver.save_image(
             image=tensor,
             output_file_type="jpeg",
             quality=100,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="photo",
         )
 
         # Should be .jpeg, NOT .jpg
-        filepath = os.path.join(temp_output_dir, "photo.jpeg")
+        filepath = os.path.join(class_output_dir, "photo.jpeg")
         assert os.path.exists(filepath), "Expected .jpeg extension to be preserved"
         # Verify .jpg was NOT created
-        jpg_path = os.path.join(temp_output_dir, "photo.jpg")
+        jpg_path = os.path.join(class_output_dir, "photo.jpg")
         assert not os.path.exists(jpg_path), "Should not normalize .jpeg to .jpg"
 
-    def test_empty_file_type_defaults_to_png(self, temp_output_dir):
+    def test_empty_file_type_defaults_to_png(self, class_output_dir, ones_8, saver):
         """Empty file type defaults to PNG."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="",  # Empty format
             quality=100,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="noformat",
         )
 
-        filepath = os.path.join(temp_output_dir, "noformat.png")
+        filepath = os.path.join(class_output_dir, "noformat.png")
         assert os.path.exists(filepath)
 
 
 class TestFilenameConstruction:
     """Tests for filename prefix/suffix."""
 
-    def test_prefix_applied(self, temp_output_dir):
+    def test_prefix_applied(self, class_output_dir, ones_8, saver):
         """Prefix is applied to filename."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="photo",
             filename_prefix="upscaled_",
         )
 
-        filepath = os.path.join(temp_output_dir, "upscaled_photo.png")
+        filepath = os.path.join(class_output_dir, "upscaled_photo.png")
         assert os.path.exists(filepath)
 
-    def test_suffix_applied(self, temp_output_dir):
+    def test_suffix_applied(self, class_output_dir, ones_8, saver):
         """Suffix is applied to filename."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="photo",
             filename_suffix="_2x",
         )
 
-        filepath = os.path.join(temp_output_dir, "photo_2x.png")
+        filepath = os.path.join(class_output_dir, "photo_2x.png")
         assert os.path.exists(filepath)
 
-    def test_prefix_and_suffix_combined(self, temp_output_dir):
+    def test_prefix_and_suffix_combined(self, class_output_dir, ones_8, saver):
         """Both prefix and suffix are applied."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
-            output_directory=temp_output_dir,
+            output_directory=class_output_dir,
             output_base_name="photo",
             filename_prefix="upscaled_",
             filename_suffix="_2x",
         )
 
-        filepath = os.path.join(temp_output_dir, "upscaled_photo_2x.png")
+        filepath = os.path.join(class_output_dir, "upscaled_photo_2x.png")
         assert os.path.exists(filepath)
 
 
 class TestOverwriteSkipMode:
     """Tests for Skip overwrite mode."""
 
-    def test_skip_mode_does_not_overwrite(self, temp_output_dir):
+    def test_skip_mode_does_not_overwrite(self, temp_output_dir, ones_8, saver):
         """Skip mode leaves existing file unchanged."""
         filepath = os.path.join(temp_output_dir, "existing.png")
 
         # Create existing file with known content
-        original_img = Image.new("RGB", (50, 50), color="red")
-        original_img.save(filepath)
-        original_size = os.path.getsize(filepath)
+        _write_existing(filepath)
 
         # Try to save different image with Skip mode
-        tensor = torch.ones(1, 100, 100, 3, dtype=torch.float32)  # Larger image
-
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Skip",
@@ -401,7 +390,8 @@ class TestOverwriteSkipMode:
         )
 
         # File should be unchanged
-        assert os.path.getsize(filepath) == original_size
+        with open(filepath, "rb") as f:
+            assert f.read() == EXISTING_FILE_BYTES
 
         # Result should have empty images list
         assert result["ui"]["images"] == []
@@ -410,20 +400,16 @@ class TestOverwriteSkipMode:
 class TestOverwriteRenameMode:
     """Tests for Rename overwrite mode."""
 
-    def test_rename_mode_creates_new_file(self, temp_output_dir):
+    def test_rename_mode_creates_new_file(self, temp_output_dir, ones_8, saver):
         """Rename mode creates new file with _1 suffix."""
         filepath = os.path.join(temp_output_dir, "photo.png")
 
         # Create existing file
-        original_img = Image.new("RGB", (50, 50), color="red")
-        original_img.save(filepath)
+        _write_existing(filepath)
 
         # Save new image with Rename mode
-        tensor = torch.ones(1, 100, 100, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Rename",
@@ -431,29 +417,22 @@ class TestOverwriteRenameMode:
             output_base_name="photo",
         )
 
-        # Original should still exist
-        assert os.path.exists(filepath)
-
-        # New file should exist with _1 suffix
-        renamed_path = os.path.join(temp_output_dir, "photo_1.png")
-        assert os.path.exists(renamed_path)
+        # Original should still exist, next to the new file with _1 suffix
+        assert set(os.listdir(temp_output_dir)) == {"photo.png", "photo_1.png"}
 
         # Result should reference the renamed file
         assert result["ui"]["images"][0]["filename"] == "photo_1.png"
 
-    def test_rename_mode_increments_counter(self, temp_output_dir):
+    def test_rename_mode_increments_counter(self, temp_output_dir, ones_8, saver):
         """Rename mode finds next available number."""
         # Create existing files
         for i in ["", "_1", "_2"]:
             filepath = os.path.join(temp_output_dir, f"photo{i}.png")
-            Image.new("RGB", (50, 50), color="red").save(filepath)
+            _write_existing(filepath)
 
         # Save new image with Rename mode
-        tensor = torch.ones(1, 100, 100, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Rename",
@@ -463,21 +442,23 @@ class TestOverwriteRenameMode:
 
         # Should create photo_3.png
         assert result["ui"]["images"][0]["filename"] == "photo_3.png"
-        assert os.path.exists(os.path.join(temp_output_dir, "photo_3.png"))
+        assert set(os.listdir(temp_output_dir)) == {
+            "photo.png",
+            "photo_1.png",
+            "photo_2.png",
+            "photo_3.png",
+        }
 
 
 class TestDefaultOutputDirectory:
     """Tests for default output directory resolution."""
 
-    def test_creates_output_directory(self, temp_output_dir):
+    def test_creates_output_directory(self, temp_output_dir, ones_8, saver):
         """Output directory is created if it doesn't exist."""
         nested_dir = os.path.join(temp_output_dir, "a", "b", "c")
 
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
         saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
@@ -487,98 +468,99 @@ class TestDefaultOutputDirectory:
 
         assert os.path.exists(os.path.join(nested_dir, "deep.png"))
 
-    def test_default_directory_uses_comfy_output(self, temp_output_dir):
+    def test_default_directory_uses_comfy_output(self, temp_output_dir, mock_folder_paths, ones_8):
         """When no output_directory, uses ComfyUI output directory."""
-        # Mock folder_paths.get_output_directory to return temp_output_dir
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
-        with mock.patch.object(
-            batch_saver_module, "folder_paths", create=True
-        ) as mock_folder_paths:
-            mock_folder_paths.get_output_directory.return_value = temp_output_dir
-
-            tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-            saver = BatchImageSaver()
-            saver.save_image(
-                image=tensor,
-                output_file_type="png",
-                quality=100,
-                overwrite_mode="Overwrite",
-                output_directory="",  # Empty - use default
-                output_base_name="test",
-            )
+        saver = BatchImageSaver()
+        saver.save_image(
+            image=ones_8,
+            output_file_type="png",
+            quality=100,
+            overwrite_mode="Overwrite",
+            output_directory="",  # Empty - use default
+            output_base_name="test",
+        )
 
-            # Should save to temp_output_dir/test.png
-            expected_path = os.path.join(temp_output_dir, "test.png")
-            assert os.path.exists(expected_path)
+        # Should save to temp_output_dir/test.png
+        expected_path = os.path.join(temp_output_dir, "test.png")
+        assert os.path.exists(expected_path)
 
-    def test_relative_path_prepends_comfy_output(self, temp_output_dir):
+    def test_relative_path_prepends_comfy_output(self, temp_output_dir, mock_folder_paths, ones_8):
         """Relative path (wired from loader) is prepended with ComfyUI output dir."""
-        # Mock folder_paths.get_output_directory to return temp_output_dir
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
-        with mock.patch.object(
-            batch_saver_module, "folder_paths", create=True
-        ) as mock_folder_paths:
-            mock_folder_paths.get_output_directory.return_value = temp_output_dir
-
-            tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-            saver = BatchImageSaver()
-            saver.save_image(
-                image=tensor,
-                output_file_type="png",
-                quality=100,
-                overwrite_mode="Overwrite",
-                output_directory="images",  # Relative path (wired from loader)
-                output_base_name="test",
-            )
+        saver = BatchImageSaver()
+        saver.save_image(
+            image=ones_8,
+            output_file_type="png",
+            quality=100,
+            overwrite_mode="Overwrite",
+            output_directory="images",  # Relative path (wired from loader)
+            output_base_name="test",
+        )
 
-            # Should save to temp_output_dir/images/test.png
-            expected_path = os.path.join(temp_output_dir, "images", "test.png")
-            assert os.path.exists(expected_path), f"Expected {expected_path} to exist"
+        # Should save to temp_output_dir/images/test.png
+        expected_path = os.path.join(temp_output_dir, "images", "test.png")
+        assert os.path.exists(expected_path), f"Expected {expected_path} to exist"
 
-    def test_absolute_path_used_directly(self, temp_output_dir):
+    def test_absolute_path_used_directly(self, temp_output_dir, mock_folder_paths, ones_8):
         """Absolute path is used directly without modification."""
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
         # Create a separate directory for the absolute path test
         absolute_dir = os.path.join(temp_output_dir, "absolute_test")
         os.makedirs(absolute_dir, exist_ok=True)
 
-        with mock.patch.object(
-            batch_saver_module, "folder_paths", create=True
-        ) as mock_folder_paths:
-            mock_folder_paths.get_output_directory.return_value = temp_output_dir
+        saver = BatchImageSaver()
+        saver.save_image(
+            image=ones_8,
+            output_file_type="png",
+            quality=100,
+            overwrite_mode="Overwrite",
+            output_directory=absolute_dir,  # Absolute path
+            output_base_name="test",
+        )
 
-            tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
+        # Should save directly to absolute_dir/test.png, NOT temp_output_dir/absolute_test/test.png
+        expected_path = os.path.join(absolute_dir, "test.png")
+        assert os.path.exists(expected_path), f"Expected {expected_path} to exist"
 
-            saver = BatchImageSaver()
-            saver.save_image(
-                image=tensor,
+    def test_output_directory_looked_up_once(self, temp_output_dir, mock_folder_paths, ones_8):
+        """ComfyUI's output directory is resolved once per node, not per save."""
+        saver = BatchImageSaver()
+        for i in range(3):
+            result = saver.save_image(
+                image=ones_8,
                 output_file_type="png",
                 quality=100,
                 overwrite_mode="Overwrite",
-                output_directory=absolute_dir,  # Absolute path
-                output_base_name="test",
+                output_directory="images",
+                output_base_name=f"test{i}",
             )
 
-            # Should save directly to absolute_dir/test.png, NOT temp_output_dir/absolute_test/test.png
-            expected_path = os.path.join(absolute_dir, "test.png")
-            assert os.path.exists(expected_path), f"Expected {expected_path} to exist"
+        assert mock_folder_paths.get_output_directory.call_count == 1
+        assert result["ui"]["images"][0]["subfolder"] == "images"
+
+    def test_subfolder_follows_prefix_with_separator(self, temp_output_dir, mock_folder_paths, ones_8):
+        """A prefix containing a separator is reflected in the preview subfolder."""
+        os.makedirs(os.path.join(temp_output_dir, "images", "upscaled"))
+        saver = BatchImageSaver()
+        result = saver.save_image(
+            image=ones_8,
+            output_file_type="png",
+            quality=100,
+            overwrite_mode="Overwrite",
+            output_directory="images",
+            output_base_name="test",
+            filename_prefix="upscaled/",
+        )
+
+        assert result["ui"]["images"][0]["filename"] == "test.png"
+        assert result["ui"]["images"][0]["subfolder"] == os.path.join("images", "upscaled")
 
 
 class TestFallbackFilename:
     """Tests for fallback filename generation."""
 
-    def test_generates_fallback_when_no_original(self, temp_output_dir):
-        """Generates output_NNNN when no output_base_name provided."""
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
-        saver = BatchImageSaver()
+    def test_generates_fallback_when_no_original(self, temp_output_dir, ones_8, saver):
+        """Generates output_<start stamp>_NNNNNN when no output_base_name provided."""
         result = saver.save_image(
-            image=tensor,
+            image=ones_8,
             output_file_type="png",
             quality=100,
             overwrite_mode="Overwrite",
@@ -590,8 +572,25 @@ class TestFallbackFilename:
         filename = result["ui"]["images"][0]["filename"]
         assert filename.startswith("output_")
         assert filename.endswith(".png")
-        # Check file exists
-        assert os.path.exists(os.path.join(temp_output_dir, filename))
+        # Check file exists (and is the only one written)
+        assert os.listdir(temp_output_dir) == [filename]
+
+    def test_fallback_names_are_unique(self, temp_output_dir, saver, ones_8):
+        """Repeated fallback saves never reuse a name."""
+        filenames = set()
+        for _ in range(20):
+            result = saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="",
+            )
+            filenames.add(result["result"][1])
+
+        assert len(filenames) == 20
+        assert len(os.listdir(temp_output_dir)) == 20
 
 
 class TestBroadcastBehavior:
@@ -604,12 +603,8 @@ class TestBroadcastBehavior:
         assert "unique_id" in result["hidden"]
         assert result["hidden"]["unique_id"] == "UNIQUE_ID"
 
-    def test_broadcasts_executed_event_when_server_available(self, temp_output_dir):
+    def test_broadcasts_executed_event_when_server_available(self, temp_output_dir, ones_8):
         """Broadcasts 'executed' event with correct args when server is available."""
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
         # Create mock PromptServer
         mock_server_instance = mock.MagicMock()
         mock_prompt_server = mock.MagicMock()
@@ -619,7 +614,7 @@ class TestBroadcastBehavior:
             with mock.patch.object(batch_saver_module, "PromptServer", mock_prompt_server):
                 saver = BatchImageSaver()
                 result = saver.save_image(
-                    image=tensor,
+                    image=ones_8,
                     output_file_type="png",
                     quality=100,
                     overwrite_mode="Overwrite",
@@ -636,12 +631,8 @@ class TestBroadcastBehavior:
         assert "output" in call_args[0][1]  # Output data
         assert call_args[1]["sid"] is None  # Broadcast to ALL clients
 
-    def test_no_broadcast_without_unique_id(self, temp_output_dir):
+    def test_no_broadcast_without_unique_id(self, temp_output_dir, ones_8):
         """No broadcast when unique_id is None."""
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
         mock_server_instance = mock.MagicMock()
         mock_prompt_server = mock.MagicMock()
         mock_prompt_server.instance = mock_server_instance
@@ -650,7 +641,7 @@ class TestBroadcastBehavior:
             with mock.patch.object(batch_saver_module, "PromptServer", mock_prompt_server):
                 saver = BatchImageSaver()
                 result = saver.save_image(
-                    image=tensor,
+                    image=ones_8,
                     output_file_type="png",
                     quality=100,
                     overwrite_mode="Overwrite",
@@ -662,19 +653,15 @@ class TestBroadcastBehavior:
         # send_sync should NOT have been called
         mock_server_instance.send_sync.assert_not_called()
 
-    def test_no_crash_without_server(self, temp_output_dir):
+    def test_no_crash_without_server(self, temp_output_dir, ones_8):
         """No crash when HAS_SERVER is False (default test environment)."""
-        import comfyui_batch_image_processing.nodes.batch_saver as batch_saver_module
-
-        tensor = torch.ones(1, 50, 50, 3, dtype=torch.float32)
-
         # Ensure HAS_SERVER is False (simulating test environment)
         with mock.patch.object(batch_saver_module, "HAS_SERVER", False):
             with mock.patch.object(batch_saver_module, "PromptServer", None):
                 saver = BatchImageSaver()
                 # Should not raise an exception
                 result = saver.save_image(
-                    image=tensor,
+                    image=ones_8,
                     output_file_type="png",
                     quality=100,
                     overwrite_mode="Overwrite",
@@ -686,3 +673,350 @@ class TestBroadcastBehavior:
         # Should still return valid result
         assert "ui" in result
         assert "result" in result
+
+
+class TestAsyncSave:
+    """Tests for background encode/write (async_save)."""
+
+    @pytest.fixture(autouse=True)
+    def drain_pending_saves(self, temp_output_dir):
+        """Make sure no background save or held preview leaks between tests.
+
+        Depends on temp_output_dir so the drain runs before that directory
+        is removed.
+        """
+        yield
+        flush_pending_saves()
+        batch_saver_module._PENDING_PREVIEWS.clear()
+
+    def test_async_save_is_optional_boolean(self):
+        """async_save and batch_complete are optional BOOLEAN inputs."""
+        optional = BatchImageSaver.INPUT_TYPES()["optional"]
+        assert optional["async_save"][0] == "BOOLEAN"
+        assert optional["async_save"][1]["default"] is False
+        assert optional["batch_complete"][0] == "BOOLEAN"
+
+    def test_flush_writes_pending_file(self, temp_output_dir, ones_8, saver):
+        """Queued saves are on disk once pending saves are flushed."""
+        result = saver.save_image(
+            image=ones_8,
+            output_file_type="png",
+            quality=100,
+            overwrite_mode="Overwrite",
+            output_directory=temp_output_dir,
+            output_base_name="queued",
+            async_save=True,
+        )
+        flush_pending_saves()
+
+        filepath = os.path.join(temp_output_dir, "queued.png")
+        assert result["result"][2] == filepath
+        with Image.open(filepath) as img:
+            assert img.size == (8, 8)
+
+    def test_batch_complete_waits_for_pending_saves(self, temp_output_dir, ones_8, saver):
+        """The last image of a batch returns only after all writes land."""
+        for i in range(3):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name=f"img{i}",
+                async_save=True,
+                batch_complete=(i == 2),
+            )
+
+        for i in range(3):
+            assert os.path.exists(os.path.join(temp_output_dir, f"img{i}.png"))
+
+    def test_rename_sees_pending_save(self, temp_output_dir, ones_8, saver):
+        """Rename mode accounts for a file that is still being written."""
+        for _ in range(2):
+            result = saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Rename",
+                output_directory=temp_output_dir,
+                output_base_name="photo",
+                async_save=True,
+            )
+
+        assert result["result"][1] == "photo_1.png"
+
+    def test_background_error_raised_on_batch_complete(self, temp_output_dir, ones_8, saver):
+        """A failed background write surfaces when the batch completes."""
+        with mock.patch.object(
+            batch_saver_module, "save_with_format", side_effect=OSError("disk full")
+        ):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="first",
+                async_save=True,
+            )
+
+        with pytest.raises(OSError, match="disk full"):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="last",
+                async_save=True,
+                batch_complete=True,
+            )
+
+    def test_previews_held_until_writes_flushed(self, temp_output_dir, ones_8):
+        """Queued saves are not previewed until batch_complete flushes them."""
+        mock_server_instance = mock.MagicMock()
+        mock_prompt_server = mock.MagicMock()
+        mock_prompt_server.instance = mock_server_instance
+
+        with mock.patch.object(batch_saver_module, "HAS_SERVER", True):
+            with mock.patch.object(batch_saver_module, "PromptServer", mock_prompt_server):
+                saver = BatchImageSaver()
+                results = [
+                    saver.save_image(
+                        image=ones_8,
+                        output_file_type="png",
+                        quality=100,
+                        overwrite_mode="Overwrite",
+                        output_directory=temp_output_dir,
+                        output_base_name=f"held{i}",
+                        async_save=True,
+                        batch_complete=(i == 2),
+                        unique_id="async-1",
+                    )
+                    for i in range(3)
+                ]
+
+        assert results[0]["ui"]["images"] == []
+        assert results[1]["ui"]["images"] == []
+        names = [entry["filename"] for entry in results[2]["ui"]["images"]]
+        assert names == ["held0.png", "held1.png", "held2.png"]
+        for name in names:
+            assert os.path.exists(os.path.join(temp_output_dir, name))
+        mock_server_instance.send_sync.assert_called_once()
+
+    def test_background_error_raised_on_next_save(self, temp_output_dir, ones_8, saver):
+        """A failed write surfaces on the next call even without batch_complete."""
+        with mock.patch.object(
+            batch_saver_module, "save_with_format", side_effect=OSError("disk full")
+        ):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="first",
+                async_save=True,
+            )
+            batch_saver_module._PENDING_SAVES[
+                os.path.join(temp_output_dir, "first.png")
+            ].exception()
+
+        with pytest.raises(OSError, match="disk full"):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="second",
+                async_save=True,
+            )
+
+    def test_finished_saves_are_pruned(self, temp_output_dir, ones_8, saver):
+        """Completed futures do not accumulate when batch_complete is not wired."""
+        for i in range(20):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name=f"img{i}",
+                async_save=True,
+            )
+            assert len(batch_saver_module._PENDING_SAVES) <= batch_saver_module._MAX_PENDING_SAVES
+
+    def test_in_flight_saves_capped(self, temp_output_dir, ones_8, saver):
+        """A full queue blocks on the oldest save before queueing another."""
+        release = threading.Event()
+
+        def slow_save(*args):
+            release.wait(5)
+
+        with mock.patch.object(batch_saver_module, "_MAX_PENDING_SAVES", 2), \
+                mock.patch.object(batch_saver_module, "save_with_format", side_effect=slow_save):
+            for i in range(2):
+                saver.save_image(
+                    image=ones_8,
+                    output_file_type="png",
+                    quality=100,
+                    overwrite_mode="Overwrite",
+                    output_directory=temp_output_dir,
+                    output_base_name=f"img{i}",
+                    async_save=True,
+                )
+            oldest = batch_saver_module._PENDING_SAVES[os.path.join(temp_output_dir, "img0.png")]
+            threading.Timer(0.1, release.set).start()
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="img2",
+                async_save=True,
+            )
+            assert oldest.done()
+            assert len(batch_saver_module._PENDING_SAVES) <= 2
+
+    def test_queued_image_is_a_copy(self, temp_output_dir, saver):
+        """Editing the source tensor after queueing does not change the written file."""
+        # RGBA uint8 is wrapped without a copy by tensor_to_pil
+        image = torch.zeros((1, 8, 8, 4), dtype=torch.uint8)
+        release = threading.Event()
+        real_save = batch_saver_module.save_with_format
+
+        def delayed_save(*args):
+            release.wait(5)
+            real_save(*args)
+
+        with mock.patch.object(batch_saver_module, "save_with_format", side_effect=delayed_save):
+            saver.save_image(
+                image=image,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name="copied",
+                async_save=True,
+            )
+            image.fill_(255)
+            release.set()
+            flush_pending_saves()
+
+        with Image.open(os.path.join(temp_output_dir, "copied.png")) as img:
+            assert img.getpixel((0, 0)) == (0, 0, 0, 0)
+
+
+class TestBatchPreview:
+    """Tests for buffering UI previews until the batch completes."""
+
+    def test_previews_released_on_batch_complete(self, temp_output_dir, saver, ones_8):
+        """Intermediate saves return no previews; the last returns all of them."""
+        results = [
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name=f"img{i}",
+                batch_preview=True,
+                batch_complete=(i == 2),
+                unique_id="preview-1",
+            )
+            for i in range(3)
+        ]
+
+        assert results[0]["ui"]["images"] == []
+        assert results[1]["ui"]["images"] == []
+        assert [entry["filename"] for entry in results[2]["ui"]["images"]] == [
+            "img0.png",
+            "img1.png",
+            "img2.png",
+        ]
+        # Saving itself is not deferred
+        assert results[0]["result"][1] == "img0.png"
+
+    def test_broadcasts_once_per_batch(self, temp_output_dir, ones_8):
+        """Only the batch-complete save sends a websocket update."""
+        mock_server_instance = mock.MagicMock()
+        mock_prompt_server = mock.MagicMock()
+        mock_prompt_server.instance = mock_server_instance
+
+        with mock.patch.object(batch_saver_module, "HAS_SERVER", True):
+            with mock.patch.object(batch_saver_module, "PromptServer", mock_prompt_server):
+                saver = BatchImageSaver()
+                for i in range(4):
+                    saver.save_image(
+                        image=ones_8,
+                        output_file_type="png",
+                        quality=100,
+                        overwrite_mode="Overwrite",
+                        output_directory=temp_output_dir,
+                        output_base_name=f"img{i}",
+                        batch_preview=True,
+                        batch_complete=(i == 3),
+                        unique_id="preview-2",
+                    )
+
+        mock_server_instance.send_sync.assert_called_once()
+        output = mock_server_instance.send_sync.call_args[0][1]["output"]
+        assert len(output["images"]) == 4
+
+    def test_batch_restart_drops_stale_previews(self, temp_output_dir, saver, ones_8):
+        """Index 0 discards previews buffered by an unfinished batch."""
+        for i in range(2):
+            saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name=f"stale{i}",
+                batch_preview=True,
+                batch_index=i,
+                unique_id="preview-3",
+            )
+
+        for i in range(2):
+            result = saver.save_image(
+                image=ones_8,
+                output_file_type="png",
+                quality=100,
+                overwrite_mode="Overwrite",
+                output_directory=temp_output_dir,
+                output_base_name=f"fresh{i}",
+                batch_preview=True,
+                batch_index=i,
+                batch_complete=(i == 1),
+                unique_id="preview-3",
+            )
+
+        assert [entry["filename"] for entry in result["ui"]["images"]] == [
+            "fresh0.png",
+            "fresh1.png",
+        ]
+
+    def test_pending_previews_capped(self, temp_output_dir, saver, ones_8):
+        """Without batch_complete the buffer keeps only the latest previews."""
+        with mock.patch.object(batch_saver_module, "_MAX_BATCH_PREVIEWS", 2):
+            for i in range(5):
+                result = saver.save_image(
+                    image=ones_8,
+                    output_file_type="png",
+                    quality=100,
+                    overwrite_mode="Overwrite",
+                    output_directory=temp_output_dir,
+                    output_base_name=f"img{i}",
+                    batch_preview=True,
+                    batch_complete=(i == 4),
+                    unique_id="preview-4",
+                )
+
+        assert [entry["filename"] for entry in result["ui"]["images"]] == [
+            "img3.png",
+            "img4.png",
+        ]
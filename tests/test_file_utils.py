@@ -123,6 +123,11 @@ class TestFilterFilesByPatterns:
         result = filter_files_by_patterns("/nonexistent/path", "*.png")
         assert result == []
 
+    def test_file_path_returns_empty(self, test_dir):
+        """A path to a regular file (not a directory) returns empty list."""
+        result = filter_files_by_patterns(os.path.join(test_dir, "image1.png"), "*.png")
+        assert result == []
+
     def test_empty_pattern_returns_empty(self, test_dir):
         """Empty pattern string returns empty list."""
         result = filter_files_by_patterns(test_dir, "")
@@ -134,3 +139,18 @@ class TestFilterFilesByPatterns:
         assert len(result) == 4
         assert "image1.png" in result
         assert "photo1.jpg" in result
+
+    def test_uppercase_extension_pattern(self, test_dir):
+        """Extension patterns match case-insensitively in both directions."""
+        result = filter_files_by_patterns(test_dir, "*.PNG,*.JPEG")
+        assert sorted(result) == ["image1.png", "image2.PNG", "image3.Png", "photo2.jpeg"]
+
+    def test_question_mark_and_brackets_supported(self, test_dir):
+        """Full glob syntax is supported, not just extension wildcards."""
+        result = filter_files_by_patterns(test_dir, "image?.[pP]ng")
+        assert sorted(result) == ["image1.png", "image2.PNG", "image3.Png"]
+
+    def test_pattern_matches_whole_name(self, test_dir):
+        """Patterns must match the entire filename, not a prefix."""
+        result = filter_files_by_patterns(test_dir, "image1")
+        assert result == []
@@ -299,3 +299,41 @@ class TestIterationStateIsolation:
                 assert IterationState.get_state(tmpdir1)["index"] == 3
                 assert IterationState.get_state(tmpdir2)["total_count"] == 10
                 assert IterationState.get_state(tmpdir2)["index"] == 7
+
+
+class TestIterationStateTransaction:
+    """Test batched state updates."""
+
+    def setup_method(self):
+        """Clear state before each test."""
+        IterationState.clear_all()
+
+    def test_transaction_writes_changes_on_exit(self):
+        """Changes made inside the block are stored when it exits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with IterationState.transaction(tmpdir) as state:
+                state["index"] = 4
+                state["total_count"] = 9
+                state["status"] = "processing"
+
+            stored = IterationState.get_state(tmpdir)
+            assert stored["index"] == 4
+            assert stored["total_count"] == 9
+            assert stored["status"] == "processing"
+
+    def test_transaction_defers_writes_until_exit(self):
+        """Stored state is untouched while the block is running."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with IterationState.transaction(tmpdir) as state:
+                state["index"] = 2
+                assert IterationState.get_state(tmpdir)["index"] == 0
+
+    def test_transaction_discards_changes_on_error(self):
+        """Changes are dropped if the block raises."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                with IterationState.transaction(tmpdir) as state:
+                    state["index"] = 6
+                    raise ValueError("boom")
+
+            assert IterationState.get_state(tmpdir)["index"] == 0
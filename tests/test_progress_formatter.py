@@ -131,6 +131,12 @@ class TestEdgeCases:
         result = formatter.format_progress(index=0, total_count=10)
         assert result["result"] == ("1 of 10 (10%)",)
 
+    def test_percentage_exact_without_float_error(self):
+        """index=28, total_count=100 -> '29 of 100 (29%)' (float math would give 28%)."""
+        formatter = BatchProgressFormatter()
+        result = formatter.format_progress(index=28, total_count=100)
+        assert result["result"] == ("29 of 100 (29%)",)
+
 
 class TestBroadcastBehavior:
     """Tests for live UI update broadcast behavior."""
@@ -164,6 +170,46 @@ class TestBroadcastBehavior:
         assert call_args[0][1]["output"]["text"] == ["3 of 10 (30%)"]  # Progress text
         assert call_args[1]["sid"] is None  # Broadcast to ALL clients
 
+    def test_skips_broadcast_for_unchanged_percentage(self):
+        """Consecutive images with the same percentage broadcast only once."""
+        import comfyui_batch_image_processing.nodes.progress_formatter as progress_formatter_module
+
+        mock_server_instance = mock.MagicMock()
+        mock_prompt_server = mock.MagicMock()
+        mock_prompt_server.instance = mock_server_instance
+
+        with mock.patch.object(progress_formatter_module, "HAS_SERVER", True):
+            with mock.patch.object(progress_formatter_module, "PromptServer", mock_prompt_server):
+                formatter = BatchProgressFormatter()
+                # 1000 images: images 101-109 are all 10%
+                for index in range(100, 109):
+                    result = formatter.format_progress(index=index, total_count=1000, unique_id="456")
+
+        mock_server_instance.send_sync.assert_called_once()
+        # The returned result is never skipped
+        assert result["result"] == ("109 of 1000 (10%)",)
+
+    def test_always_broadcasts_first_and_last_image(self):
+        """First and last images broadcast even if the percentage repeats."""
+        import comfyui_batch_image_processing.nodes.progress_formatter as progress_formatter_module
+
+        mock_server_instance = mock.MagicMock()
+        mock_prompt_server = mock.MagicMock()
+        mock_prompt_server.instance = mock_server_instance
+
+        with mock.patch.object(progress_formatter_module, "HAS_SERVER", True):
+            with mock.patch.object(progress_formatter_module, "PromptServer", mock_prompt_server):
+                formatter = BatchProgressFormatter()
+                # 0% twice: restarting a batch must still refresh the UI
+                formatter.format_progress(index=0, total_count=1000, unique_id="456")
+                formatter.format_progress(index=0, total_count=1000, unique_id="456")
+                # 99% -> 100% region: the final image is always sent
+                formatter.format_progress(index=998, total_count=1000, unique_id="456")
+                formatter.format_progress(index=999, total_count=1000, unique_id="456")
+                formatter.format_progress(index=999, total_count=1000, unique_id="456")
+
+        assert mock_server_instance.send_sync.call_count == 5
+
     def test_no_broadcast_without_unique_id(self):
         """No broadcast when unique_id is None."""
         import comfyui_batch_image_processing.nodes.progress_formatter as progress_formatter_module
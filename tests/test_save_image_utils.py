@@ -7,6 +7,7 @@ import pytest
 from PIL import Image
 
 from comfyui_batch_image_processing.utils.save_image_utils import (
+    _RENAME_PROBE_LIMIT,
     construct_filename,
     handle_existing_file,
     resolve_output_directory,
@@ -116,6 +117,43 @@ class TestHandleExistingFile:
             assert should_save is True
             assert result_path == os.path.join(tmpdir, "photo_2.png")
 
+    def test_rename_mode_single_collision_skips_listing(self):
+        """A single collision is resolved with stat probes, without listing the directory."""
+        from unittest import mock
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "photo.png")
+            with open(filepath, "w") as f:
+                f.write("test")
+
+            with mock.patch("os.scandir", wraps=os.scandir) as mock_scandir:
+                result_path, should_save = handle_existing_file(filepath, "Rename")
+
+            assert should_save is True
+            assert result_path == os.path.join(tmpdir, "photo_1.png")
+            mock_scandir.assert_not_called()
+
+    def test_rename_mode_long_run_lists_directory_once(self):
+        """Past the probe limit, remaining increments are checked against one listing."""
+        from unittest import mock
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "photo.png")
+            for name in ["photo.png"] + [f"photo_{i}.png" for i in range(1, 51)]:
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write("test")
+
+            with mock.patch("os.scandir", wraps=os.scandir) as mock_scandir, mock.patch(
+                "os.path.exists", wraps=os.path.exists
+            ) as mock_exists:
+                result_path, should_save = handle_existing_file(filepath, "Rename")
+
+            assert should_save is True
+            assert result_path == os.path.join(tmpdir, "photo_51.png")
+            assert mock_scandir.call_count == 1
+            # The original path, the stat probes, then one confirmation of the chosen name
+            assert mock_exists.call_count == 1 + _RENAME_PROBE_LIMIT + 1
+
     def test_unknown_mode_defaults_to_overwrite(self):
         """Unknown mode defaults to overwrite."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -304,6 +342,17 @@ class TestSaveWithFormat:
             assert loaded.format == "WEBP"
             loaded.close()
 
+    def test_save_webp_lossless_preserves_pixels(self):
+        """Test that WebP at quality 100 round-trips pixels exactly."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "test_exact.webp")
+            img = Image.effect_noise((64, 64), 50).convert("RGB")
+
+            save_with_format(img, filepath, "WebP", 100)
+
+            with Image.open(filepath) as loaded:
+                assert loaded.convert("RGB").tobytes() == img.tobytes()
+
     def test_jpg_converts_rgba_to_rgb(self):
         """Test that RGBA images are converted to RGB for JPEG."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -343,6 +392,48 @@ class TestSaveWithFormat:
 
             assert os.path.exists(filepath)
 
+    def test_optimize_off_by_default(self):
+        """Encoder optimization passes are opt-in."""
+        from unittest import mock
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            img = Image.new("RGB", (10, 10), color="red")
+            with mock.patch.object(img, "save", wraps=img.save) as mock_save:
+                save_with_format(img, os.path.join(tmpdir, "test.png"), "PNG", 100)
+                assert mock_save.call_args.kwargs["optimize"] is False
+
+                save_with_format(img, os.path.join(tmpdir, "opt.png"), "PNG", 100, optimize=True)
+                assert mock_save.call_args.kwargs["optimize"] is True
+
+    def test_png_compress_level_trades_size_for_speed(self):
+        """Lower PNG compress levels produce larger files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            img = Image.linear_gradient("L").resize((256, 256)).convert("RGB")
+            fast_path = os.path.join(tmpdir, "fast.png")
+            small_path = os.path.join(tmpdir, "small.png")
+
+            save_with_format(img, fast_path, "PNG", 100, compress_level=0)
+            save_with_format(img, small_path, "PNG", 100, compress_level=9)
+
+            assert os.path.getsize(fast_path) > os.path.getsize(small_path)
+            with Image.open(fast_path) as loaded:
+                assert loaded.tobytes() == img.tobytes()
+
+    def test_failed_encode_leaves_existing_file(self):
+        """An encode error does not truncate or remove the file being replaced."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "existing.jpg")
+            with open(filepath, "wb") as f:
+                f.write(b"original")
+            # 16-bit grayscale can't be written as JPEG
+            img = Image.new("I;16", (10, 10))
+
+            with pytest.raises(OSError):
+                save_with_format(img, filepath, "JPG", 90)
+
+            with open(filepath, "rb") as f:
+                assert f.read() == b"original"
+
 
 class TestTensorToPil:
     """Tests for tensor_to_pil function."""
@@ -414,3 +505,58 @@ class TestTensorToPil:
         pixel = img.getpixel((5, 5))
         assert pixel[0] == 255  # Clipped to max
         assert pixel[1] == 0  # Clipped to min
+
+    @pytest.mark.skipif(
+        not pytest.importorskip("torch", reason="torch not available"),
+        reason="torch not available",
+    )
+    def test_tensor_to_pil_rgba(self):
+        """Test that 4-channel tensors keep their alpha channel."""
+        import torch
+
+        from comfyui_batch_image_processing.utils.save_image_utils import tensor_to_pil
+
+        tensor = torch.zeros(1, 20, 30, 4, dtype=torch.float32)
+        tensor[:, :, :, 2] = 1.0  # Blue channel
+        tensor[:, :, :, 3] = 0.5  # Half-transparent
+
+        img = tensor_to_pil(tensor)
+
+        assert img.mode == "RGBA"
+        assert img.size == (30, 20)
+        assert img.getpixel((10, 10)) == (0, 0, 255, 127)
+
+    @pytest.mark.skipif(
+        not pytest.importorskip("torch", reason="torch not available"),
+        reason="torch not available",
+    )
+    def test_tensor_to_pil_does_not_modify_input(self):
+        """Test that conversion leaves the source tensor untouched."""
+        import torch
+
+        from comfyui_batch_image_processing.utils.save_image_utils import tensor_to_pil
+
+        tensor = torch.full((1, 10, 10, 3), 1.5, dtype=torch.float32)
+
+        tensor_to_pil(tensor)
+
+        assert torch.all(tensor == 1.5)
+
+    @pytest.mark.skipif(
+        not pytest.importorskip("torch", reason="torch not available"),
+        reason="torch not available",
+    )
+    def test_tensor_to_pil_uint8_passthrough(self):
+        """Test that uint8 tensors are used as-is, without rescaling."""
+        import torch
+
+        from comfyui_batch_image_processing.utils.save_image_utils import tensor_to_pil
+
+        tensor = torch.zeros(1, 10, 10, 3, dtype=torch.uint8)
+        tensor[:, :, :, 0] = 200
+        tensor[:, :, :, 1] = 17
+
+        img = tensor_to_pil(tensor)
+
+        assert img.mode == "RGB"
+        assert img.getpixel((5, 5)) == (200, 17, 0)
@@ -87,3 +87,9 @@ class TestNaturalSortKey:
         files = ["img-10.png", "img-2.png", "img-1.png"]
         result = sorted(files, key=natural_sort_key)
         assert result == ["img-1.png", "img-2.png", "img-10.png"]
+
+    def test_returns_hashable_tuple(self):
+        """Sort key is a tuple so it can be hashed and compared cheaply."""
+        key = natural_sort_key("IMG_001_foo.png")
+        assert key == ("img_", 1, "_foo.png")
+        assert hash(key) == hash(natural_sort_key("img_1_FOO.png"))
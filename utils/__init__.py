@@ -1,5 +1,8 @@
 """Utility modules for batch image processing."""
 
+import importlib
+import importlib.util
+
 # Always export modules without external dependencies
 from .sorting import natural_sort_key
 from .file_utils import filter_files_by_patterns, get_pattern_for_preset
@@ -11,43 +14,40 @@ from .queue_control import (
     trigger_next_queue,
 )
 
-# Conditionally export image utilities (requires numpy, torch, PIL)
-try:
-    from .image_utils import load_image_as_tensor
-    from .save_image_utils import (
-        construct_filename,
-        handle_existing_file,
-        resolve_output_directory,
-        save_with_format,
-        tensor_to_pil,
-    )
-
-    __all__ = [
-        "natural_sort_key",
-        "filter_files_by_patterns",
-        "get_pattern_for_preset",
-        "IterationState",
-        "trigger_next_queue",
-        "stop_auto_queue",
-        "should_continue",
-        "HAS_SERVER",
-        "load_image_as_tensor",
-        "tensor_to_pil",
-        "save_with_format",
-        "construct_filename",
-        "handle_existing_file",
-        "resolve_output_directory",
-    ]
-except ImportError:
-    # Allow import to succeed even without ComfyUI dependencies
-    # This enables running tests for modules that don't need these dependencies
-    __all__ = [
-        "natural_sort_key",
-        "filter_files_by_patterns",
-        "get_pattern_for_preset",
-        "IterationState",
-        "trigger_next_queue",
-        "stop_auto_queue",
-        "should_continue",
-        "HAS_SERVER",
-    ]
+# Image utilities (require numpy, torch, PIL) are imported on first access,
+# so importing the lightweight helpers above doesn't pull in torch
+_LAZY_EXPORTS = {
+    "load_image_as_tensor": "image_utils",
+    "tensor_to_pil": "save_image_utils",
+    "save_with_format": "save_image_utils",
+    "construct_filename": "save_image_utils",
+    "handle_existing_file": "save_image_utils",
+    "resolve_output_directory": "save_image_utils",
+}
+
+
+def __getattr__(name: str):
+    """Import image utilities lazily on first attribute access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+__all__ = [
+    "natural_sort_key",
+    "filter_files_by_patterns",
+    "get_pattern_for_preset",
+    "IterationState",
+    "trigger_next_queue",
+    "stop_auto_queue",
+    "should_continue",
+    "HAS_SERVER",
+]
+
+# Only advertise image utilities when their dependencies are installed
+# This enables running tests for modules that don't need these dependencies
+if all(importlib.util.find_spec(dep) is not None for dep in ("numpy", "torch", "PIL")):
+    __all__ += list(_LAZY_EXPORTS)
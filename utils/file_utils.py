@@ -1,13 +1,29 @@
 """File filtering utilities for batch image processing."""
 
 import fnmatch
+import functools
 import os
+import re
+from typing import Callable
 
 
+_DEFAULT_PATTERN = "*.png,*.jpg,*.jpeg,*.webp"
+
+_PRESET_PATTERNS = {
+    "All Images": _DEFAULT_PATTERN,
+    "PNG Only": "*.png",
+    "JPG Only": "*.jpg,*.jpeg",
+}
+
+
+@functools.lru_cache(maxsize=16)
 def get_pattern_for_preset(preset: str, custom_pattern: str = "") -> str:
     """
     Get glob pattern string for a given filter preset.
 
+    Results are memoized, so the validate and load calls made for each
+    queued iteration share one lookup per (preset, custom_pattern) pair.
+
     Args:
         preset: One of "All Images", "PNG Only", "JPG Only", or "Custom"
         custom_pattern: Custom pattern to use when preset is "Custom"
@@ -15,18 +31,43 @@ def get_pattern_for_preset(preset: str, custom_pattern: str = "") -> str:
     Returns:
         Comma-separated glob patterns string
     """
-    default_pattern = "*.png,*.jpg,*.jpeg,*.webp"
+    if preset == "Custom":
+        return custom_pattern.strip() or _DEFAULT_PATTERN
 
-    presets = {
-        "All Images": "*.png,*.jpg,*.jpeg,*.webp",
-        "PNG Only": "*.png",
-        "JPG Only": "*.jpg,*.jpeg",
-    }
+    return _PRESET_PATTERNS.get(preset, _DEFAULT_PATTERN)
 
-    if preset == "Custom":
-        return custom_pattern.strip() if custom_pattern.strip() else default_pattern
 
-    return presets.get(preset, default_pattern)
+# Glob metacharacters; an extension free of these can be matched with endswith()
+_GLOB_CHARS = frozenset("*?[")
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_matcher(pattern_string: str) -> Callable[[str], bool] | None:
+    """
+    Build a case-insensitive filename matcher for comma-separated glob patterns.
+
+    When every pattern is a plain extension glob ("*.png"), which covers all
+    the presets, names are matched with a single str.endswith() on a tuple of
+    extensions. Other patterns are translated with fnmatch and joined into one
+    alternation regex, so each filename is matched once instead of per pattern.
+    Cached by pattern string since the same presets are used on every call.
+
+    Args:
+        pattern_string: Comma-separated glob patterns (e.g., "*.png,*.jpg")
+
+    Returns:
+        Predicate taking a filename, or None if the string contains no patterns
+    """
+    patterns = [p.strip() for p in pattern_string.split(",") if p.strip()]
+    if not patterns:
+        return None
+
+    if all(p.startswith("*.") and not _GLOB_CHARS.intersection(p[1:]) for p in patterns):
+        extensions = tuple(p[1:].lower() for p in patterns)
+        return lambda name: name.lower().endswith(extensions)
+
+    regex = re.compile("|".join(fnmatch.translate(p) for p in patterns), re.IGNORECASE)
+    return lambda name: regex.match(name) is not None
 
 
 def filter_files_by_patterns(directory: str, pattern_string: str) -> list[str]:
@@ -36,6 +77,10 @@ def filter_files_by_patterns(directory: str, pattern_string: str) -> list[str]:
     Files are filtered using case-insensitive matching. Only regular files
     in the top level of the directory are included (no recursion into subdirectories).
 
+    The scan is a single os.scandir pass: entry types come from the directory
+    listing, so only symlinks (or filesystems that don't report entry types)
+    cost an extra stat per entry.
+
     Args:
         directory: Path to the directory to search
         pattern_string: Comma-separated glob patterns (e.g., "*.png,*.jpg")
@@ -43,28 +88,22 @@ def filter_files_by_patterns(directory: str, pattern_string: str) -> list[str]:
     Returns:
         List of filenames (not full paths) that match any of the patterns
     """
-    if not os.path.isdir(directory):
-        return []
-
-    # Parse comma-separated patterns and strip whitespace
-    patterns = [p.strip().lower() for p in pattern_string.split(",") if p.strip()]
-
-    if not patterns:
+    matches = _compile_matcher(pattern_string)
+    if matches is None:
         return []
 
     matching_files = []
 
-    for entry in os.listdir(directory):
-        # Skip directories, only include regular files
-        full_path = os.path.join(directory, entry)
-        if not os.path.isfile(full_path):
-            continue
-
-        # Case-insensitive matching
-        entry_lower = entry.lower()
-        for pattern in patterns:
-            if fnmatch.fnmatch(entry_lower, pattern):
-                matching_files.append(entry)
-                break  # Don't add same file multiple times
+    try:
+        # scandir yields the entry type from the directory listing itself,
+        # so is_file() needs no extra stat call except for symlinks
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Cheap name match first, then skip directories (only regular files)
+                if matches(entry.name) and entry.is_file():
+                    matching_files.append(entry.name)
+    except OSError:
+        # Nonexistent path, not a directory, or permission denied
+        return []
 
     return matching_files
@@ -34,7 +34,9 @@ def load_image_as_tensor(filepath: str) -> torch.Tensor:
     img = img.convert("RGB")
 
     # Convert to tensor: float32 in [0.0, 1.0], shape [1, H, W, C]
-    array = np.array(img).astype(np.float32) / 255.0
-    tensor = torch.from_numpy(array)[None,]  # Add batch dimension
+    # Cast and scale in torch so the only full-size float buffer is the output
+    # (astype + "/ 255.0" in numpy allocated two of them)
+    array = np.array(img)  # uint8 [H, W, C]
+    tensor = torch.from_numpy(array).to(torch.float32).div_(255.0)[None,]  # Add batch dimension
 
     return tensor
@@ -6,7 +6,8 @@ to persist across node executions.
 """
 
 import os
-from typing import Literal
+from contextlib import contextmanager
+from typing import Iterator, Literal
 
 # Status type for batch processing
 StatusType = Literal["idle", "processing", "completed"]
@@ -58,6 +59,26 @@ class IterationState:
             }
         return cls._instances[key]
 
+    @classmethod
+    @contextmanager
+    def transaction(cls, directory: str) -> Iterator[dict]:
+        """Batch several state updates for a directory into one read and write.
+
+        Yields a working copy of the directory's state. Changes are written
+        back in a single update when the block exits normally and discarded
+        if it raises.
+
+        Args:
+            directory: Directory path to update state for
+
+        Yields:
+            Mutable copy of the state dictionary
+        """
+        stored = cls.get_state(directory)
+        working = dict(stored)
+        yield working
+        stored.update(working)
+
     @classmethod
     def reset(cls, directory: str) -> None:
         """Reset state for a directory.
@@ -1,5 +1,6 @@
 """Image saving utilities for ComfyUI batch processing."""
 
+import io
 import os
 
 # Graceful imports for testing without ComfyUI dependencies
@@ -18,6 +19,21 @@ try:
 except ImportError:
     Image = None
 
+# PIL modes for [H, W, C] uint8 arrays that can be wrapped with frombuffer
+_MODE_BY_CHANNELS = {3: "RGB", 4: "RGBA"}
+
+# libwebp speed/size trade-off (0 = fastest, 6 = smallest)
+_WEBP_METHOD = 4
+# In lossless mode libwebp reads quality as compression effort rather than
+# fidelity; 75 is cwebp's default and yields near-identical sizes to 100
+# at roughly two thirds of the encode time
+_WEBP_LOSSLESS_EFFORT = 75
+
+# Rename mode probes this many increments with a stat each before falling back
+# to a single directory listing; the common case (a handful of collisions)
+# stays independent of how many files the output directory holds
+_RENAME_PROBE_LIMIT = 8
+
 
 def tensor_to_pil(tensor):
     """
@@ -25,7 +41,8 @@ def tensor_to_pil(tensor):
 
     Args:
         tensor: torch.Tensor with shape [1, H, W, C] or [H, W, C],
-                float32 values in [0.0, 1.0] range
+                float32 values in [0.0, 1.0] range (uint8 0-255 tensors
+                are passed through without scaling)
 
     Returns:
         PIL.Image in RGB mode
@@ -37,43 +54,89 @@ def tensor_to_pil(tensor):
         raise ImportError("tensor_to_pil requires torch, numpy, and PIL")
 
     # Handle batch dimension
-    if len(tensor.shape) == 4:
-        tensor = tensor.squeeze(0)  # [1, H, W, C] -> [H, W, C]
-
-    # Convert: multiply by 255, clip to valid range, convert to uint8
-    array = (255.0 * tensor.cpu().numpy()).clip(0, 255).astype(np.uint8)
-    return Image.fromarray(array)
-
-
-def save_with_format(img, filepath: str, format: str, quality: int = 100):
+    if tensor.ndim == 4:
+        tensor = tensor[0]  # [1, H, W, C] -> [H, W, C]
+
+    tensor = tensor.detach()
+    if tensor.dtype == torch.uint8:
+        # Already 8-bit: no scaling needed; .numpy() shares the CPU tensor's storage
+        array = tensor.cpu().numpy()
+    elif tensor.device.type != "cpu":
+        # Narrow to uint8 on the device so only a quarter of the bytes
+        # cross to host memory
+        array = tensor.mul(255.0).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+    else:
+        # Scale into one scratch buffer and clip it in place
+        array = tensor.numpy() * np.float32(255.0)
+        np.clip(array, 0, 255, out=array)
+        array = array.astype(np.uint8)
+    array = np.ascontiguousarray(array)
+
+    mode = _MODE_BY_CHANNELS.get(array.shape[-1]) if array.ndim == 3 else None
+    if mode is None:
+        return Image.fromarray(array)
+
+    # Wrap the raw buffer directly instead of round-tripping through fromarray
+    height, width = array.shape[:2]
+    return Image.frombuffer(mode, (width, height), array, "raw", mode, 0, 1)
+
+
+def save_with_format(
+    img,
+    filepath: str,
+    format: str,
+    quality: int = 100,
+    optimize: bool = False,
+    compress_level: int = 4,
+):
     """
     Save PIL image with format-specific options.
 
+    The image is encoded into memory first and written with a single
+    write(), instead of the many small writes the encoders issue when
+    saving straight to a file. A failed encode also never leaves a
+    truncated file at filepath.
+
     Args:
         img: PIL.Image to save
         filepath: Output path (should already have correct extension)
         format: "PNG", "JPG", "JPEG", or "WebP"
         quality: Quality for JPG/WebP (1-100). PNG ignores this.
+        optimize: Extra encoder passes for smaller PNG/JPG files. Often
+                  ~10x slower for PNG (forces maximum zlib compression);
+                  WebP ignores this.
+        compress_level: PNG zlib level 0-9. Lower is faster and larger
+                        (1 encodes several times faster than 6 for ~10%
+                        bigger files); other formats ignore this.
     """
     if Image is None:
         raise ImportError("save_with_format requires PIL")
 
     format_upper = format.upper()
+    buffer = io.BytesIO()
 
     if format_upper == "PNG":
-        img.save(filepath, "PNG", compress_level=4)
+        img.save(buffer, "PNG", compress_level=compress_level, optimize=optimize)
     elif format_upper in ("JPG", "JPEG"):
         # JPEG doesn't support alpha
         if img.mode == "RGBA":
             img = img.convert("RGB")
         # PIL recommends quality <= 95
-        img.save(filepath, "JPEG", quality=min(95, quality))
+        img.save(buffer, "JPEG", quality=min(95, quality), optimize=optimize)
     elif format_upper == "WEBP":
-        # quality=100 triggers lossless mode
-        img.save(filepath, "WEBP", quality=quality, lossless=(quality == 100))
+        if quality == 100:
+            # quality=100 triggers lossless mode
+            img.save(
+                buffer, "WEBP", lossless=True, quality=_WEBP_LOSSLESS_EFFORT, method=_WEBP_METHOD
+            )
+        else:
+            img.save(buffer, "WEBP", quality=quality, method=_WEBP_METHOD)
     else:
         # Default to PNG for unknown formats
-        img.save(filepath, "PNG", compress_level=4)
+        img.save(buffer, "PNG", compress_level=compress_level, optimize=optimize)
+
+    with open(filepath, "wb") as f:
+        f.write(buffer.getbuffer())
 
 
 def construct_filename(
@@ -121,13 +184,25 @@ def handle_existing_file(filepath: str, mode: str) -> tuple:
     if mode == "Rename":
         # Simple increment: photo_1.png, photo_2.png (not zero-padded)
         base, ext = os.path.splitext(filepath)
-        counter = 1
+        stem = os.path.basename(base)
         max_attempts = 10000
-        while counter <= max_attempts:
+        taken = None
+        for counter in range(1, max_attempts + 1):
+            if counter > _RENAME_PROBE_LIMIT and taken is None:
+                # Long run of existing increments: list the directory once and
+                # check the remaining candidates in memory
+                try:
+                    with os.scandir(os.path.dirname(filepath) or ".") as entries:
+                        taken = {entry.name for entry in entries}
+                except OSError:
+                    taken = set()
+            if taken is not None and f"{stem}_{counter}{ext}" in taken:
+                continue
             new_path = f"{base}_{counter}{ext}"
+            # Always confirm on disk: case-insensitive filesystems can collide
+            # on names the exact-match set lookup misses
             if not os.path.exists(new_path):
                 return (new_path, True)
-            counter += 1
         # If we exceed max attempts, just use the last tried path
         raise RuntimeError(
             f"Could not find unique filename after {max_attempts} attempts"
@@ -2,8 +2,11 @@
 
 import re
 
+# Compiled once at import; the capture group keeps digit runs in the split output
+_DIGIT_RUNS = re.compile(r"(\d+)")
 
-def natural_sort_key(s: str) -> list:
+
+def natural_sort_key(s: str) -> tuple:
     """
     Generate key for natural sorting (case-insensitive).
 
@@ -14,9 +17,9 @@ def natural_sort_key(s: str) -> list:
         s: String to generate sort key for
 
     Returns:
-        List of string and integer parts for comparison
+        Tuple of alternating string and integer parts for comparison
     """
-    return [
-        int(text) if text.isdigit() else text.lower()
-        for text in re.split(r"(\d+)", s)
-    ]
+    parts = _DIGIT_RUNS.split(s.lower())
+    # Splitting on a capture group puts digit runs at every odd index
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)